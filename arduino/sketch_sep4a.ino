@@ -1,3 +1,42 @@
+// Mettre à 1 pour le protocole binaire : trames compactes à 500 échantillons/s, 115200 bauds
+// (côté Python : serial_protocol='binary'). À 0, protocole texte historique à 9600 bauds.
+#define BINARY_PROTOCOL 0
+
+#if BINARY_PROTOCOL
+const unsigned long SAMPLE_PERIOD_US = 2000;  // 500 Hz
+unsigned long nextSample = 0;
+uint16_t sequence = 0;
+
+void writeWord(uint16_t value, uint8_t &checksum) {
+    uint8_t low = value & 0xFF;
+    uint8_t high = value >> 8;
+    Serial.write(low);
+    Serial.write(high);
+    checksum += low + high;
+}
+
+void setup() {
+    Serial.begin(115200);
+    nextSample = micros();
+}
+
+void loop() {
+    // Cadence fixe basée sur micros() plutôt qu'un delay()
+    if ((long)(micros() - nextSample) < 0) {
+        return;
+    }
+    nextSample += SAMPLE_PERIOD_US;
+
+    // Trame : 0xA5 0x5A | séquence | ADC A0 | ADC A1 | somme de contrôle (petit-boutiste)
+    uint8_t checksum = 0;
+    Serial.write(0xA5);
+    Serial.write(0x5A);
+    writeWord(sequence++, checksum);
+    writeWord(analogRead(A0), checksum);  // Comptes ADC bruts 10 bits
+    writeWord(analogRead(A1), checksum);
+    Serial.write(checksum);
+}
+#else
 void setup() {
     Serial.begin(9600);
 }
@@ -10,4 +49,4 @@ void loop() {
     Serial.println(voltage2);
     delay(100);  // Délai pour éviter d'envoyer trop rapidement
 }
-
+#endif
@@ -1,8 +1,42 @@
 import tkinter as tk
 from tkinter import Canvas
+import numpy as np
+from PIL import Image, ImageDraw, ImageTk
+
+# Geometry of the original design, for a 96 px wide battery (5% of a 1920 px screen)
+REFERENCE_WIDTH = 96
+BORDER_OFFSET = 5
+TOP_HEIGHT = 10
+OUTLINE_WIDTH = 3
+SUPERSAMPLING = 4  # Overlay drawn larger then downscaled for smooth edges
+
+class BatteryLayout:
+    # Every coordinate needed to draw a battery of a given size, computed once per size
+    def __init__(self, width, height):
+        self.size = (width, height)
+        self.scale = max(width / REFERENCE_WIDTH, 1)  # Thicker lines and a bigger bolt on large screens
+        self.border = round(BORDER_OFFSET * self.scale)
+        self.top_height = round(TOP_HEIGHT * self.scale)
+        self.outline_width = max(round(OUTLINE_WIDTH * self.scale), 1)
+        self.x1, self.x2 = self.border + 1, width - self.border - 1
+        self.bottom = height - self.border + 1
+        self.max_height = height - 2 * self.border - self.top_height
+        self.top = self.bottom - self.max_height
+        # Before the first layout the canvas is 1x1: nothing can be drawn
+        self.valid = self.max_height > 0 and self.x2 > self.x1
+
+    def cover_coords(self, ratio):
+        # The cover hides the part of the gradient above the current level
+        return self.x1, self.top, self.x2, self.bottom - ratio * self.max_height
 
 class BatteryDisplay:
-    def __init__(self, parent, relx, rely, anchor, label_text):
+    # Pre-rendered images shared by every battery, keyed by Tk interpreter and size
+    # (a PhotoImage only exists in the interpreter that created it)
+    gradient_cache = {}
+    overlay_cache = {}
+    layout_cache = {}
+
+    def __init__(self, parent, relx, rely, anchor, label_text, persistent=True, threshold=0.02):
         self.canvas = Canvas(parent, bg='white', highlightthickness=0)
         self.canvas.place(relx=relx, rely=rely, relwidth=0.05, relheight=0.5, anchor=anchor)
         self.label = tk.Label(parent, text=label_text, font=("Arial", 16), bg='white', fg='black')
@@ -10,11 +44,100 @@ class BatteryDisplay:
         self.production_label = tk.Label(parent, text="0.0W", font=("Arial", 16), bg='white', fg='black')
         self.production_label.place(relx=relx, rely=rely - 0.28, anchor=anchor)
 
+        # Persistent mode: static items are drawn once, updates only move the cover rectangle
+        self.persistent = persistent
+        self.threshold = threshold  # Minimum voltage change that triggers a redraw
+        self.layout = None  # Geometry for the current canvas size, updated on <Configure> only
+        self.level = None
+        self.ratio = 0.0  # Last displayed fill ratio, reapplied when the canvas is resized
+        self.production_text = "0.0W"
+        self.cover_id = None
+        self.canvas.bind('<Configure>', self.on_configure)
+
+    def on_configure(self, event):
+        if self.layout and self.layout.size == (event.width, event.height):
+            return
+        key = (event.width, event.height)
+        if key not in BatteryDisplay.layout_cache:
+            BatteryDisplay.layout_cache[key] = BatteryLayout(event.width, event.height)
+        self.layout = BatteryDisplay.layout_cache[key]
+        if self.persistent:
+            self.build_static_items()
+        elif self.level is not None:
+            self.redraw_battery(self.level)
+
     def draw_battery(self, voltage, max_voltage=5):
+        if not self.persistent:
+            self.redraw_battery(voltage, max_voltage)
+            return
+
+        # Skip the canvas entirely when the level barely moved
+        if self.level is None or abs(voltage - self.level) >= self.threshold:
+            self.level = voltage
+            self.ratio = min(max(voltage / max_voltage, 0), 1)
+            if self.cover_id:
+                self.canvas.coords(self.cover_id, *self.layout.cover_coords(self.ratio))
+
+        # Update the production label
+        production_text = f"{voltage:.1f}W"
+        if production_text != self.production_text:
+            self.production_text = production_text
+            self.production_label.config(text=production_text)
+
+    def build_static_items(self):
+        # Three items: gradient, cover and an overlay image with the outline, the top and the bolt
         self.canvas.delete('all')
-        canvas_height = self.canvas.winfo_height()
-        canvas_width = self.canvas.winfo_width()
-        
+        self.cover_id = None
+        layout = self.layout
+        if not layout.valid:
+            return
+
+        self.canvas.create_image(layout.x1, layout.top, image=self.gradient_image(layout.x2 - layout.x1, layout.max_height),
+                                 anchor='nw')
+        self.cover_id = self.canvas.create_rectangle(*layout.cover_coords(self.ratio), fill='white', outline='')
+        self.canvas.create_image(0, 0, image=self.overlay_image(layout), anchor='nw')
+
+    def gradient_image(self, width, height):
+        key = (self.canvas.tk, width, height)
+        if key not in BatteryDisplay.gradient_cache:
+            # Same colours as draw_gradient_rectangle, computed for every row at once (bottom row = ratio 0)
+            ratio = np.arange(height - 1, -1, -1) / height
+            red = np.where(ratio < 0.5, (255 * ratio * 2).astype(np.uint8), 255)
+            green = np.where(ratio < 0.5, 255, (255 * (1 - (ratio - 0.5) * 2)).astype(np.uint8))
+            pixels = np.zeros((height, width, 3), dtype=np.uint8)
+            pixels[:, :, 0] = red[:, None]
+            pixels[:, :, 1] = green[:, None]
+            BatteryDisplay.gradient_cache[key] = ImageTk.PhotoImage(Image.fromarray(pixels, 'RGB'), master=self.canvas)
+        return BatteryDisplay.gradient_cache[key]
+
+    def overlay_image(self, layout):
+        key = (self.canvas.tk, layout.size)
+        if key not in BatteryDisplay.overlay_cache:
+            # Drawn with PIL at a higher resolution, then downscaled once for anti-aliased edges
+            width, height = layout.size
+            factor = SUPERSAMPLING
+            image = Image.new('RGBA', (width * factor, height * factor), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+            border, top_height = layout.border * factor, layout.top_height * factor
+            draw.rectangle((border, top_height + border, (width - layout.border) * factor, (height - layout.border) * factor),
+                           outline='black', width=layout.outline_width * factor)
+            draw.rectangle((width * 0.25 * factor, border, width * 0.75 * factor, border + top_height), fill='black')
+            draw.polygon([(x * factor, y * factor) for x, y in self.lightning_points(width * 0.5, height * 0.5, layout.scale)],
+                         fill='black')
+            image = image.resize(layout.size, Image.LANCZOS)
+            BatteryDisplay.overlay_cache[key] = ImageTk.PhotoImage(image, master=self.canvas)
+        return BatteryDisplay.overlay_cache[key]
+
+    def redraw_battery(self, voltage, max_voltage=5):
+        self.canvas.delete('all')
+        self.cover_id = None
+        self.level = voltage
+        self.production_text = f"{voltage:.1f}W"
+        self.production_label.config(text=self.production_text)
+        if not self.layout or not self.layout.valid:
+            return
+        canvas_width, canvas_height = self.layout.size
+
         border_offset = 5
         top_height = 10
 
@@ -22,7 +145,7 @@ class BatteryDisplay:
         self.canvas.create_rectangle(border_offset, top_height + border_offset,
                                      canvas_width - border_offset, canvas_height - border_offset,
                                      outline='black', width=3)
-        
+
         # Calculate the height of the current level
         height = (voltage / max_voltage) * (canvas_height - 2 * border_offset - top_height)
 
@@ -33,17 +156,14 @@ class BatteryDisplay:
 
         # Draw the gradient
         self.draw_gradient_rectangle(border_offset + 1, canvas_height - height - border_offset - top_height,
-                                     canvas_width - border_offset - 1, canvas_height - border_offset, 
+                                     canvas_width - border_offset - 1, canvas_height - border_offset,
                                      height, canvas_height - 2 * border_offset - top_height)
 
         # Draw the lightning bolt
         self.draw_lightning(canvas_width * 0.5, canvas_height * 0.5)
 
-        # Update the production label
-        self.production_label.config(text=f"{voltage:.1f}W")
-
     def draw_gradient_rectangle(self, x1, y1, x2, y2, current_height, max_height):
-        for i in range(max_height):
+        for i in range(max(int(max_height), 0)):
             ratio = i / max_height
             if ratio < 0.5:
                 r = int(255 * (ratio * 2))
@@ -57,14 +177,9 @@ class BatteryDisplay:
             if i < current_height:
                 self.canvas.create_line(x1, y2 - i, x2, y2 - i, fill=fill_color)
 
+    def lightning_points(self, x, y, scale=1):
+        return [(x + dx * scale, y + dy * scale) for dx, dy in
+                ((10, -20), (-10, 3), (-3, 3), (-10, 20), (10, -3), (3, -3), (10, -20))]
+
     def draw_lightning(self, x, y):
-        lightning_points = [
-            (x + 10, y - 20),
-            (x - 10, y + 3),
-            (x - 3, y + 3),
-            (x - 10, y + 20),
-            (x + 10, y - 3),
-            (x + 3, y - 3),
-            (x + 10, y - 20),
-        ]
-        self.canvas.create_polygon(lightning_points, fill='black', outline='black')
\ No newline at end of file
+        self.canvas.create_polygon(self.lightning_points(x, y), fill='black', outline='black')
\ No newline at end of file
@@ -0,0 +1,199 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import tracemalloc
+from collections import defaultdict
+from time import perf_counter, process_time
+import tkinter as tk
+import numpy as np
+from main import ElectricGame
+
+# Banc d'essai sans intervention : pilote ElectricGame pendant N pas et mesure chaque étape.
+# Sur une machine sans écran, lancer sous Xvfb : xvfb-run python benchmark.py
+
+class StageTimer:
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def wrap(self, obj, name, stage):
+        # Remplace la méthode de l'instance par une version chronométrée
+        method = getattr(obj, name)
+        samples = self.samples[stage]
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                samples.append(perf_counter() - start)
+
+        setattr(obj, name, timed)
+
+    def summary(self):
+        return {stage: summarize(values) for stage, values in self.samples.items()}
+
+def summarize(values):
+    values = np.asarray(values) * 1000  # Millisecondes
+    if not len(values):
+        return {'count': 0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': int(len(values)),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(values.max()),
+    }
+
+def memory_kb():
+    # Mémoire résidente actuelle si disponible (Linux), sinon le pic
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def canvas_items(game):
+    counts = {f'battery{player + 1}': len(battery.canvas.find_all()) for player, battery in enumerate(game.batteries)}
+    counts['total'] = sum(counts.values())
+    return counts
+
+def run_benchmark(ticks=2000, update_interval=10, render_every=1, replay_path=None, seed=0, trace_memory=False, withdraw=False,
+                  players=2):
+    root = tk.Tk()
+    if withdraw:
+        root.withdraw()  # Plus rapide, mais les canevas gardent une taille de 1x1
+    game_duration = (ticks + 1) * update_interval / 1000 + 1
+    game = ElectricGame(root, test_mode=replay_path is None, update_interval=update_interval, game_duration=game_duration,
+                        seed=seed, replay_path=replay_path, replay_speed=None, players=players)
+
+    # Démarrer la partie puis arrêter sa boucle after : le banc pilote lui-même les pas.
+    # Le compte à rebours est sauté pour mesurer le score dès le début.
+    game.start_game()
+    game.loops.stop_all()
+    game.countdown_label.pack_forget()
+    game.countdown_label = None
+    game.countdown_time = 0
+    game.engine.countdown = 0
+    root.update()
+
+    timer = StageTimer()
+    timer.wrap(game, 'read_input', 'input')
+    timer.wrap(game, 'update_score', 'scoring')
+    for battery in game.batteries:
+        timer.wrap(battery, 'draw_battery', 'draw_battery')
+    timer.wrap(game.graph, 'update_graph', 'update_graph')
+
+    if trace_memory:
+        tracemalloc.start()
+    memory_start = memory_kb()
+    items_start = canvas_items(game)
+    tick_times = []
+    flush_times = []
+
+    start = perf_counter()
+    cpu_start = process_time()  # Temps CPU du processus (tous threads), indépendant de l'attente de Tk
+    for tick in range(ticks):
+        tick_start = perf_counter()
+        game.simulation_step()
+        if tick % render_every == 0:
+            game.render_frame()
+        flush_start = perf_counter()
+        root.update()  # Laisser Tk peindre réellement l'image
+        tick_end = perf_counter()
+        flush_times.append(tick_end - flush_start)
+        tick_times.append(tick_end - tick_start)
+    elapsed = perf_counter() - start
+    cpu_time = process_time() - cpu_start
+
+    results = {
+        'version': 1,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'ticks': ticks,
+        'update_interval_ms': update_interval,
+        'render_every': render_every,
+        'players': game.players,
+        'input': 'replay' if replay_path else 'test',
+        'elapsed_s': elapsed,
+        'target_ticks_per_s': 1000 / update_interval,
+        'achieved_ticks_per_s': ticks / elapsed if elapsed else 0,
+        'stages': timer.summary(),
+        'tk_flush': summarize(flush_times),
+        'tick': summarize(tick_times),
+        'cpu_ms_per_tick': cpu_time / ticks * 1000 if ticks else 0,
+        'canvas_items': {'start': items_start, 'end': canvas_items(game)},
+        'memory_kb': {'start': memory_start, 'end': memory_kb(), 'growth': memory_kb() - memory_start},
+        'graph_fps': game.graph.fps,
+    }
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results['tracemalloc_kb'] = {'current': current // 1024, 'peak': peak // 1024}
+
+    game.input_handler.close()
+    root.destroy()
+    return results
+
+def print_report(results):
+    print(f"{results['ticks']} pas en {results['elapsed_s']:.2f} s : "
+          f"{results['achieved_ticks_per_s']:.1f} pas/s (cible {results['target_ticks_per_s']:.0f})")
+    stages = dict(results['stages'], tk_flush=results['tk_flush'], tick=results['tick'])
+    print(f"{'étape':<14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, summary in stages.items():
+        if summary['count']:
+            print(f"{stage:<14}{summary['p50_ms']:>10.3f}{summary['p95_ms']:>10.3f}{summary['p99_ms']:>10.3f}")
+    print(f"Éléments de canevas : {results['canvas_items']['start']['total']} -> {results['canvas_items']['end']['total']}")
+    print(f"Mémoire : {results['memory_kb']['growth']:+d} Ko")
+    print(f"CPU : {results['cpu_ms_per_tick']:.3f} ms par pas ({results['players']} joueurs)")
+
+def player_scaling(runs):
+    # Coût CPU marginal d'un joueur supplémentaire : pente des moindres carrés du CPU par pas
+    # en fonction du nombre de joueurs, et charge CPU (%) au pas de simulation visé
+    players = np.array([run['players'] for run in runs], dtype=float)
+    cpu = np.array([run['cpu_ms_per_tick'] for run in runs])
+    slope, intercept = np.polyfit(players, cpu, 1) if len(runs) > 1 else (0.0, float(cpu[0]))
+    return {
+        'cpu_ms_per_tick': dict(zip(map(int, players), cpu.tolist())),
+        'cpu_ms_per_player': float(slope),
+        'cpu_ms_base': float(intercept),
+        'cpu_load': {int(count): ms / run['update_interval_ms'] for count, ms, run in zip(players, cpu, runs)},
+    }
+
+def print_scaling(scaling):
+    print(f"{'joueurs':<10}{'CPU ms/pas':>12}")
+    for count, ms in scaling['cpu_ms_per_tick'].items():
+        print(f"{count:<10}{ms:>12.3f}")
+    print(f"Par joueur supplémentaire : {scaling['cpu_ms_per_player']:.3f} ms par pas")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesure du temps par image de la boucle de jeu")
+    parser.add_argument('--ticks', type=int, default=2000)
+    parser.add_argument('--update-interval', type=int, default=10)
+    parser.add_argument('--render-every', type=int, default=1, help="Rendu tous les N pas de simulation")
+    parser.add_argument('--replay', help="Enregistrement à rejouer à la place de TestInput")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--trace-memory', action='store_true', help="Suivre les allocations Python avec tracemalloc")
+    parser.add_argument('--withdraw', action='store_true', help="Fenêtre masquée (pas de rendu Tk réel)")
+    parser.add_argument('--players', type=int, nargs='+', default=[2],
+                        help="Nombre(s) de joueurs ; plusieurs valeurs mesurent le coût CPU par joueur ajouté")
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args()
+    if args.replay and args.players != [2]:
+        parser.error("un enregistrement rejoué contient deux joueurs : --players est réservé à TestInput")
+
+    runs = []
+    for players in args.players:
+        run = run_benchmark(args.ticks, args.update_interval, args.render_every, args.replay, args.seed,
+                            args.trace_memory, args.withdraw, players)
+        print_report(run)
+        runs.append(run)
+    results = runs[0]
+    if len(runs) > 1:
+        results = {'runs': runs, 'scaling': player_scaling(runs)}
+        print_scaling(results['scaling'])
+    with open(args.output, 'w') as output:
+        json.dump(results, output, indent=2)
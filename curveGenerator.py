@@ -0,0 +1,131 @@
+import argparse
+import os
+import numpy as np
+
+def generate_continuous_curve(length, min_value, max_value, min_plateau_duration=15, max_plateau_duration=30, rng=None):
+    # Courbe en plateaux construite en bloc : mêmes règles que la version historique
+    # (trois niveaux, deux plateaux consécutifs toujours différents), mais reproductible avec une graine.
+    rng = np.random.default_rng(rng)
+    if length <= 0:
+        return np.empty(0)
+
+    mid_value = (min_value + max_value) / 2
+    plateau_values = np.array([min_value, mid_value, max_value], dtype=float)
+
+    # Assez de plateaux pour couvrir la courbe même si toutes les durées sont minimales
+    count = length // max(min_plateau_duration, 1) + 2
+    durations = rng.integers(min_plateau_duration, max_plateau_duration + 1, size=count)
+    durations[0] += 1  # Le premier plateau inclut la valeur de départ
+
+    # Un saut de 1 ou 2 niveaux modulo 3 garantit un plateau différent du précédent
+    steps = rng.integers(1, 3, size=count)
+    steps[0] = rng.integers(0, 3)
+    levels = np.cumsum(steps) % 3
+
+    return np.repeat(plateau_values[levels], np.maximum(durations, 1))[:length]
+
+def generate_ramp_curve(length, min_value, max_value, min_ramp_duration=100, max_ramp_duration=300, rng=None):
+    # Rampes linéaires entre des niveaux tirés au hasard
+    rng = np.random.default_rng(rng)
+    if length <= 0:
+        return np.empty(0)
+
+    count = length // max(min_ramp_duration, 1) + 2
+    durations = rng.integers(min_ramp_duration, max_ramp_duration + 1, size=count)
+    knots_x = np.concatenate(([0], np.cumsum(durations)))
+    knots_y = rng.uniform(min_value, max_value, size=count + 1)
+    return np.interp(np.arange(length), knots_x, knots_y)
+
+def generate_peak_curve(length, min_value, max_value, peak_count=3, min_peak_width=50, max_peak_width=200, rng=None):
+    # Consommation de base avec des pics de demande gaussiens
+    rng = np.random.default_rng(rng)
+    if length <= 0:
+        return np.empty(0)
+
+    x = np.arange(length)[:, None]
+    centers = rng.uniform(0, length, size=peak_count)
+    widths = rng.uniform(min_peak_width, max_peak_width, size=peak_count)
+    heights = rng.uniform(0.5, 1, size=peak_count)
+    peaks = (heights * np.exp(-0.5 * ((x - centers) / widths) ** 2)).max(axis=1)
+    return min_value + (max_value - min_value) * peaks
+
+PROFILES = {
+    'plateau': generate_continuous_curve,
+    'ramp': generate_ramp_curve,
+    'peak': generate_peak_curve,
+}
+
+# Durées caractéristiques de chaque profil, en secondes de jeu : les générateurs comptent en pas,
+# la conversion dépend du pas de simulation
+PROFILE_DURATIONS = {
+    'plateau': {'min_plateau_duration': 1.5, 'max_plateau_duration': 3.0},
+    'ramp': {'min_ramp_duration': 2.0, 'max_ramp_duration': 6.0},
+    'peak': {'min_peak_width': 1.0, 'max_peak_width': 4.0},
+}
+
+def duration_steps(seconds, update_interval):
+    return max(1, round(seconds * 1000 / update_interval))
+
+def profile_options(profile, update_interval):
+    return {name: duration_steps(seconds, update_interval) for name, seconds in PROFILE_DURATIONS[profile].items()}
+
+class ScenarioStore:
+    # Courbes précalculées stockées sur disque en float32 (.npy) et rechargées en mémoire mappée
+    def __init__(self, directory='scenarios'):
+        self.directory = directory
+
+    def path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def names(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(filename[:-4] for filename in os.listdir(self.directory) if filename.endswith('.npy'))
+
+    def save(self, name, values):
+        os.makedirs(self.directory, exist_ok=True)
+        np.save(self.path(name), np.asarray(values, dtype=np.float32))
+
+    def load(self, name, length=None):
+        values = np.load(self.path(name), mmap_mode='r')
+        if length is None or len(values) >= length:
+            return values[:length]
+
+        # Scénario trop court pour la durée de jeu : on prolonge la dernière valeur
+        padded = np.empty(length, dtype=values.dtype)
+        padded[:len(values)] = values
+        padded[len(values):] = values[-1] if len(values) else 0
+        return padded
+
+    def precompute(self, length, min_value, max_value, count=10, seed=0, profiles=None, update_interval=10):
+        # Un générateur enfant par scénario : chaque courbe ne dépend que de la graine, de son profil et de son rang,
+        # quel que soit le sous-ensemble de profils précalculé
+        profiles = list(profiles or PROFILES)
+        unknown = [profile for profile in profiles if profile not in PROFILES]
+        if unknown:
+            raise ValueError(f"Profils inconnus : {', '.join(unknown)}")
+        children = np.random.SeedSequence(seed).spawn(count * len(PROFILES))
+        names = []
+        for profile in profiles:
+            p = list(PROFILES).index(profile)
+            options = profile_options(profile, update_interval)
+            for i in range(count):
+                name = f"{profile}-{i:03d}"
+                rng = np.random.default_rng(children[p * count + i])
+                self.save(name, PROFILES[profile](length, min_value, max_value, rng=rng, **options))
+                names.append(name)
+        return names
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Précalcule des scénarios de consommation")
+    parser.add_argument('--directory', default='scenarios')
+    parser.add_argument('--duration', type=float, default=60, help="Durée de jeu en secondes")
+    parser.add_argument('--update-interval', type=int, default=10, help="Pas de simulation en millisecondes")
+    parser.add_argument('--count', type=int, default=10, help="Nombre de scénarios par profil")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    total_points = int(args.duration * 1000 / args.update_interval)
+    names = ScenarioStore(args.directory).precompute(total_points, 5, 10, count=args.count, seed=args.seed,
+                                                     update_interval=args.update_interval)
+    print(f"{len(names)} scénarios écrits dans {args.directory}")
@@ -0,0 +1,182 @@
+import selectors
+import threading
+import time
+import numpy as np
+from serialReader import SampleRingBuffer
+from serialProtocol import AsciiLineDecoder, BinaryFrameDecoder
+
+# Noms de ports typiques des cartes Arduino (macOS, Linux)
+DISCOVERY_PATTERNS = ('usbmodem', 'ttyACM', 'ttyUSB')
+
+def discover_ports(patterns=DISCOVERY_PATTERNS):
+    from serial.tools import list_ports
+    return sorted(port.device for port in list_ports.comports() if any(pattern in port.device for pattern in patterns))
+
+class Device:
+    # Une carte : son port, son décodeur et son tampon d'échantillons
+    def __init__(self, port, serial_port, decoder, buffer_size, channels):
+        self.port = port
+        self.serial_port = serial_port
+        self.decoder = decoder
+        self.buffer = SampleRingBuffer(buffer_size, channels)
+        self.last_values = None
+        self.last_timestamp = None  # Horodatage du dernier échantillon reçu
+
+class DeviceManager:
+    # Plusieurs cartes lues par un seul thread via selectors. Les voies de toutes les cartes sont mises
+    # bout à bout : carte 0 -> joueurs 1 et 2, carte 1 -> joueurs 3 et 4, etc.
+    # Même interface que SerialInput (open / read_values / read_samples / close).
+    BAUDRATES = {'ascii': 9600, 'binary': 115200}
+    # Période d'échantillonnage nominale des cartes (s) : delay(100) en texte, 500 Hz en binaire
+    SAMPLE_PERIODS = {'ascii': 0.1, 'binary': 0.002}
+
+    def __init__(self, ports='auto', protocol='ascii', baudrate=None, buffer_size=4096, channels_per_device=2):
+        self.ports = ports  # Liste de ports, ou 'auto' pour détecter les cartes branchées
+        self.protocol = protocol
+        self.baudrate = baudrate or self.BAUDRATES[protocol]
+        self.buffer_size = buffer_size
+        self.channels_per_device = channels_per_device
+        self.devices = []
+        self.selector = None
+        self.reader = None
+        self.stop_event = threading.Event()
+        self.reader_cpu_time = 0.0  # Temps CPU consommé par le thread de lecture
+        self.port_list = None
+
+    @property
+    def channels(self):
+        return len(self.resolve_ports()) * self.channels_per_device
+
+    def resolve_ports(self):
+        # La détection n'a lieu qu'une fois : l'ordre des cartes (et donc des joueurs) reste stable
+        if self.port_list is None:
+            ports = discover_ports() if self.ports == 'auto' else list(self.ports)
+            if not ports:
+                # Sans carte, la partie démarrerait avec zéro joueur et une consommation nulle
+                raise ValueError("Aucune carte détectée : branchez au moins une carte ou indiquez les ports")
+            self.port_list = ports
+        return self.port_list
+
+    def open(self):
+        import serial  # Import différé, comme pour SerialInput
+
+        if self.devices:
+            return
+        self.selector = selectors.DefaultSelector()
+        for port in self.resolve_ports():
+            try:
+                # Lecture non bloquante : c'est le sélecteur qui attend les données
+                serial_port = serial.Serial(port, self.baudrate, timeout=0)
+            except serial.SerialException:
+                print(f"Erreur : impossible d'ouvrir le port série {port}.")
+                # Carte absente : ses joueurs restent à zéro, la position des autres ne change pas
+                device = Device(port, None, None, self.buffer_size, self.channels_per_device)
+                device.last_values = (0.0,) * self.channels_per_device
+                self.devices.append(device)
+                continue
+            decoder = BinaryFrameDecoder() if self.protocol == 'binary' else AsciiLineDecoder()
+            device = Device(port, serial_port, decoder, self.buffer_size, self.channels_per_device)
+            self.devices.append(device)
+            self.selector.register(serial_port.fileno(), selectors.EVENT_READ, device)
+
+        self.stop_event.clear()
+        self.reader = threading.Thread(target=self.run, daemon=True)
+        self.reader.start()
+
+    def run(self):
+        cpu_start = time.thread_time()
+        while not self.stop_event.is_set():
+            for key, _ in self.selector.select(timeout=0.1):
+                device = key.data
+                try:
+                    chunk = device.serial_port.read(device.serial_port.in_waiting or 1)
+                except (OSError, TypeError):  # Carte débranchée
+                    self.selector.unregister(key.fileobj)
+                    continue
+                if not chunk:
+                    continue
+                now = time.perf_counter()
+                values = device.decoder.decode(chunk)
+                if len(values):
+                    device.buffer.push_many(self.sample_times(device, now, len(values)), values)
+            self.reader_cpu_time = time.thread_time() - cpu_start
+
+    def sample_times(self, device, now, count):
+        # Comme SerialReaderThread : le dernier échantillon vient d'arriver, les précédents sont espacés d'une période.
+        # Horodatages strictement croissants par carte, sinon la fusion de read_samples confond les échantillons.
+        timestamps = now - np.arange(count - 1, -1, -1) * self.SAMPLE_PERIODS[self.protocol]
+        if device.last_timestamp is not None and timestamps[0] <= device.last_timestamp:
+            timestamps = np.linspace(device.last_timestamp, now, count + 1)[1:]
+        device.last_timestamp = now
+        return timestamps
+
+    def read_values(self):
+        # Dernière valeur de chaque voie ; une carte sans nouvel échantillon garde sa valeur précédente
+        updated = False
+        for device in self.devices:
+            sample = device.buffer.latest()
+            if sample is not None:
+                device.last_values = sample[1]
+                updated = True
+        if not updated or any(device.last_values is None for device in self.devices):
+            return (None,) * self.channels
+        return tuple(value for device in self.devices for value in device.last_values)
+
+    def read_samples(self):
+        # Fusion des lots de toutes les cartes sur l'union de leurs horodatages (valeur maintenue entre deux échantillons)
+        batches = [device.buffer.read_new() for device in self.devices]
+        if not any(len(timestamps) for timestamps, _ in batches):
+            return np.empty(0), np.empty((0, self.channels))
+
+        timestamps = np.sort(np.concatenate([timestamps for timestamps, _ in batches]))
+        columns = []
+        for device, (device_timestamps, device_values) in zip(self.devices, batches):
+            held = np.full((len(timestamps), self.channels_per_device), np.nan)
+            if device.last_values is not None:
+                held[:] = device.last_values
+            if len(device_timestamps):
+                indices = np.searchsorted(device_timestamps, timestamps, side='right') - 1
+                known = indices >= 0
+                held[known] = device_values[indices[known]]
+                device.last_values = tuple(device_values[-1].tolist())
+            columns.append(held)
+
+        values = np.hstack(columns)
+        complete = ~np.isnan(values).any(axis=1)  # Attendre que chaque carte ait envoyé au moins un échantillon
+        return timestamps[complete], values[complete]
+
+    def backlog(self):
+        # (octets pas encore lus sur les ports, échantillons décodés pas encore consommés), comme SerialInput
+        waiting = samples = 0
+        for device in self.devices:
+            if not device.serial_port:
+                continue
+            try:
+                waiting += device.serial_port.in_waiting
+            except (OSError, TypeError):
+                pass
+            samples += device.buffer.backlog()
+        return waiting, samples
+
+    def stats(self):
+        stats = {'devices': len(self.devices), 'reader_cpu_s': self.reader_cpu_time}
+        for device in self.devices:
+            if not device.decoder:
+                continue
+            for key, value in device.decoder.stats().items():
+                stats[key] = stats.get(key, 0) + value
+            stats['overwritten'] = stats.get('overwritten', 0) + device.buffer.overwritten
+        return stats
+
+    def close(self):
+        self.stop_event.set()
+        if self.reader and self.reader.is_alive():
+            self.reader.join(timeout=1)
+        self.reader = None
+        for device in self.devices:
+            if device.serial_port:
+                device.serial_port.close()
+        self.devices = []
+        if self.selector:
+            self.selector.close()
+            self.selector = None
@@ -0,0 +1,51 @@
+from time import perf_counter
+
+class FixedStepScheduler:
+    # Ordonnanceur à pas fixe basé sur l'horloge murale :
+    # la simulation avance à cadence fixe (et rattrape son retard après une image lente),
+    # le rendu tourne à sa propre cadence et saute les images quand il est en retard.
+    def __init__(self, step_interval, render_interval, max_catch_up=50, clock=perf_counter):
+        self.step_interval = step_interval / 1000  # Intervalles donnés en millisecondes
+        self.render_interval = render_interval / 1000
+        self.max_catch_up = max_catch_up  # Nombre maximal de pas exécutés dans un même rappel
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.start_time = self.clock()
+        self.steps_done = 0
+        self.next_render = self.start_time
+        self.skipped_frames = 0
+
+    def elapsed(self):
+        return self.clock() - self.start_time
+
+    def due_steps(self):
+        # Nombre de pas de simulation à exécuter maintenant pour rester calé sur l'horloge murale.
+        # Au-delà de max_catch_up, le reste est rattrapé au rappel suivant pour garder la main à Tk.
+        target = int(self.elapsed() / self.step_interval)
+        steps = max(0, min(target - self.steps_done, self.max_catch_up))
+        self.steps_done += steps
+        return steps
+
+    def render_due(self):
+        now = self.clock()
+        if now < self.next_render:
+            return False
+
+        # Images en retard : on les saute et on se recale sur la prochaine échéance
+        late = int((now - self.next_render) / self.render_interval)
+        self.skipped_frames += late
+        self.next_render += (late + 1) * self.render_interval
+        return True
+
+    def lag(self):
+        # Retard de la simulation sur l'horloge murale, en secondes
+        return max(0.0, self.elapsed() - self.steps_done * self.step_interval)
+
+    def next_delay(self):
+        # Délai en millisecondes jusqu'au prochain pas ou rendu, pour root.after
+        now = self.clock()
+        next_step = self.start_time + (self.steps_done + 1) * self.step_interval
+        delay = min(next_step, self.next_render) - now
+        return max(1, int(delay * 1000))
@@ -0,0 +1,87 @@
+import math
+import numpy as np
+import curveGenerator
+from sessionBuffer import SessionBuffer
+from scoringEngine import StreamingScorer
+
+COUNTDOWN_SECONDS = 3  # Pas de score pendant le compte à rebours
+
+class GameEngine:
+    # Logique d'une partie sans interface : courbe cible, pas de simulation, tampons et score.
+    # ElectricGame l'habille avec Tk ; simulation.py la fait tourner sans écran, aussi vite que possible.
+    def __init__(self, players=2, update_interval=10, game_duration=60, countdown=COUNTDOWN_SECONDS, malus=3,
+                 plateau_duration=(1.5, 3.0), rng=None):
+        self.players = players
+        self.update_interval = update_interval  # Pas de simulation en millisecondes
+        self.game_duration = game_duration
+        self.countdown = countdown
+        self.plateau_duration = plateau_duration  # Durées min et max d'un plateau, en secondes
+        self.rng = np.random.default_rng(rng)  # Même graine, même courbe
+        # Statistiques de score incrémentales (fenêtre glissante d'une seconde)
+        self.scorer = StreamingScorer(players=players, window=max(1, int(1000 / update_interval)),
+                                      step_seconds=update_interval / 1000, malus=malus)
+        self.session = None  # Tampons préalloués de la partie en cours
+        self.time = 0
+        self.current_score = None
+
+    @property
+    def total_points(self):
+        return int(self.game_duration * 1000 / self.update_interval)  # Nombre total de points pour la durée du jeu
+
+    def consumption_curve(self, scenario_store=None, scenario=None):
+        # Un scénario précalculé est simplement mappé en mémoire, sinon on génère la courbe.
+        # Les courbes sont prévues pour deux joueurs : la cible grandit avec le nombre de joueurs.
+        if scenario:
+            curve = scenario_store.load(scenario, self.total_points)
+            return curve if self.players == 2 else curve * (self.players / 2)
+        min_plateau, max_plateau = (curveGenerator.duration_steps(seconds, self.update_interval)
+                                    for seconds in self.plateau_duration)
+        return curveGenerator.generate_continuous_curve(self.total_points, 2.5 * self.players, 5 * self.players,
+                                                        min_plateau, max_plateau, rng=self.rng)
+
+    def reset(self, consumption=None):
+        if consumption is None:
+            consumption = self.consumption_curve()
+        total_points = self.total_points
+        if self.session is None or self.session.capacity != total_points:
+            self.session = SessionBuffer(total_points, self.update_interval, self.players)
+        self.session.reset(consumption)
+        self.scorer.reset()
+        self.time = 0
+        self.current_score = None
+
+    def elapsed(self):
+        return self.time * self.update_interval / 1000  # Temps de jeu écoulé en secondes
+
+    def advance(self):
+        # Un pas de simulation ; False quand le temps de jeu est écoulé
+        self.time += 1
+        return self.elapsed() < self.game_duration
+
+    def scoring(self):
+        return self.elapsed() >= self.countdown
+
+    def record(self, voltages):
+        production = sum(voltages)  # Production totale de tous les joueurs
+        return self.session.append(voltages, production), production
+
+    def score(self, index, production, voltages):
+        # Comparer la production à la consommation du pas courant (et non à la fin de la fenêtre affichée)
+        score = self.scorer.add(production, float(self.session.consumption[index]), voltages)
+        self.session.set_score(index, score)  # NaN si le pas n'est pas noté
+        if not math.isnan(score):
+            self.current_score = score
+        return score
+
+    def step(self, voltages):
+        if not self.advance():
+            return False
+        index, production = self.record(voltages)
+        if self.scoring():
+            self.score(index, production, voltages)
+        return True
+
+    def target(self, offset=0):
+        # Consommation visée au prochain pas (offset > 0 : dans le futur, < 0 : dans le passé)
+        index = min(max(self.session.length + offset, 0), self.session.capacity - 1)
+        return float(self.session.consumption[index])
@@ -0,0 +1,75 @@
+from time import perf_counter
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+class GraphDisplay:
+    def __init__(self, parent, blit=True, ylim=12, relwidth=0.85):
+        # Figure hors pyplot : elle n'est pas retenue par le registre global de matplotlib
+        self.fig = Figure()
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.canvas_widget = self.canvas.get_tk_widget()
+        self.canvas_widget.place(relx=0.5, rely=0.5, relwidth=relwidth, relheight=1, anchor='center')
+        self.blit = blit  # Blitting sur un fond en cache plutôt qu'un rendu complet à chaque image
+
+        # Mise en forme faite une seule fois : les axes ne sont plus effacés à chaque image
+        self.ax.set_ylim([0, ylim])  # Production maximale attendue (W), selon le nombre de joueurs
+        self.ax.spines['top'].set_visible(False)
+        self.ax.spines['right'].set_visible(False)
+        self.ax.spines['left'].set_visible(False)
+        self.ax.spines['bottom'].set_visible(False)
+        # remove axis
+        self.ax.get_xaxis().set_visible(False)
+        self.ax.get_yaxis().set_visible(False)
+
+        # Les deux courbes sont créées une fois puis mises à jour avec set_data
+        self.consumption_line, = self.ax.plot([], [], label='Consommation', color='#F1C265', linewidth=7, animated=blit)
+        self.production_line, = self.ax.plot([], [], label='Production', color='#8675BA', linewidth=7, animated=blit)
+
+        # Fond mis en cache après chaque rendu complet (premier affichage, redimensionnement)
+        self.background = None
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+        # Mesure des performances du rendu
+        self.fps = 0.0  # Images par seconde effectivement affichées (moyenne glissante)
+        self.frame_time = 0.0  # Durée du dernier rendu en secondes
+        self.last_frame = None
+
+    def reset(self):
+        # Nouvelle partie : on vide les courbes sans recréer la figure
+        self.consumption_line.set_data([], [])
+        self.production_line.set_data([], [])
+        self.last_frame = None
+        self.fps = 0.0
+
+    def on_draw(self, event):
+        if self.blit:
+            # Les axes étant masqués, le fond ne dépend pas de la fenêtre de temps affichée
+            self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+            self.draw_lines()
+
+    def draw_lines(self):
+        self.ax.draw_artist(self.consumption_line)
+        self.ax.draw_artist(self.production_line)
+
+    def update_graph(self, time_axis_values, consumption_values, production_values, time, window_size, update_interval):
+        start = perf_counter()
+
+        self.consumption_line.set_data(time_axis_values[:len(consumption_values)], consumption_values)
+        self.production_line.set_data(time_axis_values[:len(production_values)], production_values)
+        self.ax.set_xlim([(time - window_size) * update_interval / 1000, (time + window_size) * update_interval / 1000])
+
+        if not self.blit or self.background is None:
+            # Rendu complet : déclenche on_draw qui met le fond en cache
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self.draw_lines()
+            self.canvas.blit(self.fig.bbox)
+
+        end = perf_counter()
+        self.frame_time = end - start
+        if self.last_frame is not None and end > self.last_frame:
+            instant_fps = 1 / (end - self.last_frame)
+            self.fps = instant_fps if self.fps == 0 else 0.9 * self.fps + 0.1 * instant_fps
+        self.last_frame = end
@@ -0,0 +1,123 @@
+from time import perf_counter
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from serialProtocol import ADC_MAX, ADC_REFERENCE
+
+# Filtres en flux entre la source d'entrée et le jeu.
+# Chaque filtre traite un lot horodaté : valeurs de forme (n, voies), en conservant son état d'un lot à l'autre.
+# latency_samples() donne le retard moyen introduit, en échantillons.
+
+class EMAFilter:
+    # Moyenne mobile exponentielle : y[i] = alpha * x[i] + (1 - alpha) * y[i - 1]
+    CHUNK = 32  # Taille des blocs vectorisés (borne l'amplitude des puissances de (1 - alpha))
+
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self.state = None
+
+    def process(self, values):
+        if not len(values) or self.alpha >= 1:
+            return values
+        if self.state is None:
+            self.state = values[0].astype(float)
+        output = np.empty(values.shape)
+        decay = 1 - self.alpha
+        for start in range(0, len(values), self.CHUNK):
+            chunk = values[start:start + self.CHUNK]
+            # Forme fermée de la récurrence sur le bloc : somme cumulée pondérée
+            powers = decay ** np.arange(1, len(chunk) + 1)[:, None]
+            weighted = np.cumsum(chunk / powers, axis=0) * powers * self.alpha
+            output[start:start + len(chunk)] = powers * self.state + weighted
+            self.state = output[start + len(chunk) - 1]
+        return output
+
+    def latency_samples(self):
+        return (1 - self.alpha) / self.alpha
+
+    def reset(self):
+        self.state = None
+
+class MedianFilter:
+    # Médiane glissante sur les size derniers échantillons (supprime les pics isolés)
+    def __init__(self, size=5):
+        self.size = size
+        self.history = None
+
+    def process(self, values):
+        if not len(values):
+            return values
+        if self.history is None:
+            self.history = np.repeat(values[:1].astype(float), self.size - 1, axis=0)
+        extended = np.concatenate((self.history, values))
+        self.history = extended[len(extended) - (self.size - 1):]
+        windows = sliding_window_view(extended, self.size, axis=0)
+        return np.median(windows, axis=-1)
+
+    def latency_samples(self):
+        return (self.size - 1) / 2
+
+    def reset(self):
+        self.history = None
+
+class CalibrationCurve:
+    # Conversion des comptes ADC en watts par interpolation linéaire d'une table mesurée au banc.
+    # Si l'entrée est en volts (protocole texte), elle est d'abord ramenée en comptes ADC.
+    def __init__(self, adc_points, watt_points, input_in_volts=True):
+        self.adc_points = np.asarray(adc_points, dtype=float)
+        self.watt_points = np.asarray(watt_points, dtype=float)
+        self.input_in_volts = input_in_volts
+
+    def process(self, values):
+        counts = values * (ADC_MAX / ADC_REFERENCE) if self.input_in_volts else values
+        return np.interp(counts, self.adc_points, self.watt_points)
+
+    def latency_samples(self):
+        return 0.0
+
+    def reset(self):
+        pass
+
+class FilterPipeline:
+    def __init__(self, filters, sample_rate=None):
+        self.filters = list(filters)
+        self.sample_rate = sample_rate  # Cadence nominale (Hz) si les horodatages ne suffisent pas à l'estimer
+        self.sample_period = 1 / sample_rate if sample_rate else None
+        self.last_timestamp = None
+        self.processing_time = 0.0
+        self.processed = 0
+
+    def process(self, timestamps, values):
+        start = perf_counter()
+        values = np.asarray(values, dtype=float)
+        for input_filter in self.filters:
+            values = input_filter.process(values)
+        self.estimate_period(timestamps)
+        self.processing_time += perf_counter() - start
+        self.processed += len(values)
+        return timestamps, values
+
+    def estimate_period(self, timestamps):
+        if not len(timestamps):
+            return
+        if self.last_timestamp is not None and not self.sample_rate:
+            span = float(timestamps[-1] - self.last_timestamp)
+            if span > 0:
+                period = span / len(timestamps)
+                self.sample_period = period if self.sample_period is None else 0.95 * self.sample_period + 0.05 * period
+        self.last_timestamp = timestamps[-1]
+
+    def reset(self):
+        for input_filter in self.filters:
+            input_filter.reset()
+        self.last_timestamp = None
+
+    def latency_report(self):
+        # Retard introduit par chaque filtre (échantillons et millisecondes) et coût de traitement mesuré
+        period = self.sample_period or 0.0
+        report = {}
+        for input_filter in self.filters:
+            samples = input_filter.latency_samples()
+            report[type(input_filter).__name__] = {'samples': samples, 'ms': float(samples * period * 1000)}
+        report['total_ms'] = sum(entry['ms'] for entry in report.values())
+        report['processing_us_per_sample'] = self.processing_time / self.processed * 1e6 if self.processed else 0.0
+        return report
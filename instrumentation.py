@@ -0,0 +1,155 @@
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+from contextlib import nullcontext
+from time import perf_counter
+import tkinter as tk
+
+# Contexte vide partagé : quand l'instrumentation est désactivée, un « with » ne coûte presque rien
+NULL_STAGE = nullcontext()
+
+class StageTimer:
+    # Chronomètre réutilisable pour une étape de la boucle (aucune allocation par mesure)
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = perf_counter() - self.start
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        return False
+
+    def snapshot(self):
+        mean = self.total / self.count if self.count else 0.0
+        return {'count': self.count, 'mean_ms': mean * 1000, 'max_ms': self.max * 1000}
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+class Instrumentation:
+    # Compteurs de la boucle de jeu, affichés en surimpression et écrits périodiquement dans un journal tournant
+    def __init__(self, root, log_path='volpil_metrics.log', log_interval=10.0, overlay_interval=0.5,
+                 max_bytes=1_000_000, backup_count=5):
+        self.root = root
+        self.stages = {}
+        self.log_interval = log_interval
+        self.overlay_interval = overlay_interval
+
+        # Cadence et gigue des rappels after
+        self.expected_callback = None
+        self.jitter = StageTimer()
+        self.frames = 0
+        self.ticks = 0
+        self.last_log = perf_counter()
+        self.last_overlay = self.last_log
+        self.fps = 0.0
+        self.ticks_per_second = 0.0
+
+        self.logger = logging.getLogger('volpil.metrics')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if log_path and not self.logger.handlers:
+            handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            self.logger.addHandler(handler)
+
+        self.overlay = tk.Label(root, font=("Courier", 12), bg='black', fg='#00ff00', justify=tk.LEFT, anchor='nw')
+        self.overlay_visible = True
+        self.show_overlay()
+        root.bind('<F3>', self.toggle_overlay)
+
+    def stage(self, name):
+        timer = self.stages.get(name)
+        if timer is None:
+            timer = self.stages[name] = StageTimer()
+        return timer
+
+    def callback_scheduled(self, delay):
+        # Heure attendue du prochain rappel, pour mesurer la gigue de after
+        self.expected_callback = perf_counter() + delay / 1000
+
+    def callback_started(self):
+        if self.expected_callback is not None:
+            late = max(0.0, perf_counter() - self.expected_callback)
+            self.jitter.count += 1
+            self.jitter.total += late
+            self.jitter.max = max(self.jitter.max, late)
+            self.expected_callback = None
+
+    def tick(self, steps=1):
+        self.ticks += steps
+
+    def frame(self):
+        self.frames += 1
+
+    def report(self, lag=0.0, input_handler=None):
+        now = perf_counter()
+        if now - self.last_overlay < self.overlay_interval and now - self.last_log < self.log_interval:
+            return
+        waiting_bytes, waiting_samples, dropped = input_counters(input_handler)
+
+        if now - self.last_overlay >= self.overlay_interval:
+            # Cadences mesurées sur la dernière fenêtre d'affichage
+            elapsed = now - self.last_overlay
+            self.fps = self.frames / elapsed
+            self.ticks_per_second = self.ticks / elapsed
+            self.frames = 0
+            self.ticks = 0
+            self.last_overlay = now
+            if self.overlay_visible:
+                self.overlay.config(text=f"FPS {self.fps:5.1f}   pas/s {self.ticks_per_second:5.1f}\n"
+                                         f"retard {lag * 1000:6.1f} ms   gigue max {self.jitter.max * 1000:5.1f} ms\n"
+                                         f"série en attente {waiting_bytes} o   échantillons {waiting_samples}   "
+                                         f"perdus {dropped}")
+                self.overlay.lift()
+
+        if now - self.last_log >= self.log_interval:
+            self.last_log = now
+            self.logger.info(json.dumps({
+                'fps': round(self.fps, 2),
+                'ticks_per_s': round(self.ticks_per_second, 2),
+                'lag_ms': round(lag * 1000, 2),
+                'serial_backlog_bytes': waiting_bytes,
+                'sample_backlog': waiting_samples,
+                'dropped_samples': dropped,
+                'after_jitter': self.jitter.snapshot(),
+                'stages': {name: timer.snapshot() for name, timer in self.stages.items()},
+            }))
+            # Nouvelle fenêtre de mesure après chaque écriture
+            for timer in self.stages.values():
+                timer.reset()
+            self.jitter.reset()
+
+    def event(self, name, **values):
+        # Événement ponctuel (changement d'écran...) écrit immédiatement dans le journal
+        self.logger.info(json.dumps(dict(values, event=name)))
+
+    def show_overlay(self):
+        self.overlay.place(relx=0, rely=0, anchor='nw')
+        self.overlay.lift()
+
+    def toggle_overlay(self, event=None):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.show_overlay()
+        else:
+            self.overlay.place_forget()
+
+def input_counters(input_handler):
+    # Octets et échantillons en attente (deux compteurs distincts) et échantillons perdus, si la source les expose
+    waiting_bytes, waiting_samples = input_handler.backlog() if hasattr(input_handler, 'backlog') else (0, 0)
+    stats = input_handler.stats() if hasattr(input_handler, 'stats') else {}
+    # Une trame corrompue laisse aussi un trou de séquence : seul dropped_frames compte les trames perdues
+    dropped = sum(stats.get(key, 0) for key in ('malformed', 'dropped_frames', 'overwritten'))
+    return waiting_bytes, waiting_samples, dropped
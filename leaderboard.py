@@ -0,0 +1,50 @@
+import bisect
+import os
+import struct
+import time
+
+# Journal en ajout seul : un enregistrement de 16 octets par partie (horodatage, score), petit-boutiste
+RECORD = struct.Struct('<dd')
+
+class Leaderboard:
+    # Classement persistant : le fichier n'est relu qu'au démarrage, puis un index trié en mémoire
+    # donne le rang d'un score par bisection (le meilleur score est le plus petit écart).
+    def __init__(self, path='leaderboard.bin'):
+        self.path = path
+        self.scores = []  # Index trié par ordre croissant
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        # Un enregistrement incomplet en fin de fichier (coupure de courant) est ignoré
+        usable = len(data) - len(data) % RECORD.size
+        self.scores = sorted(score for _, score in RECORD.iter_unpack(data[:usable]))
+
+    def add(self, score):
+        with open(self.path, 'ab') as file:
+            file.write(RECORD.pack(time.time(), score))
+            file.flush()
+            os.fsync(file.fileno())
+        bisect.insort(self.scores, score)
+        return self.rank(score)
+
+    def rank(self, score):
+        return bisect.bisect_left(self.scores, score) + 1  # +1 pour le classement humain
+
+    def __len__(self):
+        return len(self.scores)
+
+    def entries(self, rank, top_count=10, radius=2):
+        # Lignes à afficher : les top_count premiers puis une fenêtre autour du joueur.
+        # None marque un saut dans le classement ; le coût ne dépend pas du nombre de parties.
+        rows = [(i + 1, score) for i, score in enumerate(self.scores[:top_count])]
+        start = max(rank - radius, top_count + 1)
+        end = min(rank + radius, len(self.scores))
+        if start <= end:
+            if start > top_count + 1:
+                rows.append(None)
+            rows.extend((i, self.scores[i - 1]) for i in range(start, end + 1))
+        return rows
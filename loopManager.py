@@ -0,0 +1,41 @@
+class LoopManager:
+    # Propriétaire unique des rappels périodiques : chaque boucle a un nom et au plus un after en attente.
+    # Le rappel renvoie le délai (ms) avant son prochain passage, ou None pour s'arrêter.
+    def __init__(self, root):
+        self.root = root
+        self.jobs = {}  # nom -> identifiant after en attente
+        self.tokens = {}  # nom -> jeton de la boucle active, pour ignorer un rappel annulé
+
+    def start(self, name, callback, delay=0):
+        # Redémarrer une boucle existante la remplace : jamais deux boucles du même nom
+        self.stop(name)
+        token = object()
+        self.tokens[name] = token
+        self.jobs[name] = self.root.after(delay, self.run, name, callback, token)
+
+    def run(self, name, callback, token):
+        if self.tokens.get(name) is not token:
+            return
+        self.jobs.pop(name, None)
+        delay = callback()
+
+        # Le rappel a pu arrêter ou remplacer sa propre boucle (changement d'écran)
+        if self.tokens.get(name) is not token:
+            return
+        if delay is None:
+            self.tokens.pop(name, None)
+        else:
+            self.jobs[name] = self.root.after(max(0, int(delay)), self.run, name, callback, token)
+
+    def stop(self, name):
+        self.tokens.pop(name, None)
+        job = self.jobs.pop(name, None)
+        if job:
+            self.root.after_cancel(job)
+
+    def stop_all(self):
+        for name in list(self.tokens):
+            self.stop(name)
+
+    def running(self, name):
+        return name in self.tokens
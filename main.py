@@ -1,73 +1,135 @@
+import time
+# Référence prise au chargement de main.py : le démarrage de l'interpréteur Python lui-même n'est pas compté
+PROCESS_START = time.perf_counter()
 import tkinter as tk
 import random
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import os
-from PIL import Image, ImageTk  # Pour manipuler les images
-import serial
+import numpy as np
 from roundedButton import RoundedButton
 from batteryDisplay import BatteryDisplay
+from gameClock import FixedStepScheduler
+import curveGenerator
+from serialReader import SampleRingBuffer, SerialReaderThread
+from serialProtocol import AsciiLineDecoder, BinaryFrameDecoder
+from replayInput import ReplayInput, SampleRecorder
+from instrumentation import Instrumentation, NULL_STAGE
+from loopManager import LoopManager
+from screenManager import AssetCache, ScreenManager
+from leaderboard import Leaderboard
+from gameEngine import GameEngine
+from deviceManager import DeviceManager
+from sessionLog import SessionWriter
 import math
 
 os.environ['TK_SILENCE_DEPRECATION'] = '1'
 
-class GraphDisplay:
-    def __init__(self, parent):
-        self.fig, self.ax = plt.subplots()
-        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.place(relx=0.5, rely=0.5, relwidth=0.85, relheight=1, anchor='center')
-
-    def update_graph(self, time_axis_values, consumption_values, production_values, time, window_size, update_interval):
-        self.ax.clear()
-        self.ax.plot(time_axis_values[:len(consumption_values)], consumption_values, label='Consommation', color='#F1C265', linewidth=7)
-        self.ax.plot(time_axis_values[:len(production_values)], production_values, label='Production', color='#8675BA', linewidth=7)
-        self.ax.set_ylim([0, 12])
-        self.ax.set_xlim([(time - window_size) * update_interval / 1000, (time + window_size) * update_interval / 1000])
-        self.ax.spines['top'].set_visible(False)
-        self.ax.spines['right'].set_visible(False)
-        self.ax.spines['left'].set_visible(False)
-        self.ax.spines['bottom'].set_visible(False)
-        # remove axis
-        self.ax.get_xaxis().set_visible(False)
-        self.ax.get_yaxis().set_visible(False)
-
-        self.canvas.draw()
+LEADERBOARD_TOP = 10  # Nombre de meilleurs scores affichés en fin de partie
+LEADERBOARD_RADIUS = 2  # Scores affichés de part et d'autre du joueur
+BOOT_TIMINGS = ('premier affichage', 'préchauffage')  # Mesures affichées une seule fois, au démarrage
+BATTERY_SPACING = 0.06  # Écart horizontal (relatif) entre deux batteries d'un même côté
+BATTERY_WIDTH = 0.05  # Largeur relative d'une batterie (relwidth de BatteryDisplay)
 
 class SerialInput:
-    def __init__(self, port):
+    channels = 2  # Deux dynamos par carte
+    BAUDRATES = {'ascii': 9600, 'binary': 115200}  # Débit par défaut de chaque protocole
+    SAMPLE_PERIODS = {'ascii': None, 'binary': 0.002}  # Période d'échantillonnage nominale de la carte (s)
+
+    def __init__(self, port, baudrate=None, threaded=False, buffer_size=4096, protocol='ascii', recorder=None):
         self.port = port
+        self.protocol = protocol  # 'ascii' pour les anciennes cartes, 'binary' pour les trames compactes
+        self.baudrate = baudrate or self.BAUDRATES[protocol]
+        self.threaded = threaded  # Lecture dans un thread dédié plutôt que dans la boucle Tk
+        self.buffer_size = buffer_size
+        self.recorder = recorder  # SampleRecorder optionnel pour rejouer la session plus tard
         self.serial_port = None
+        self.decoder = None
+        self.buffer = None
+        self.reader = None
 
     def open(self):
+        import serial  # Import différé : inutile pour afficher l'écran d'accueil
+
         if not self.serial_port:
             try:
-                self.serial_port = serial.Serial(self.port, 9600)
+                # En mode thread, le timeout permet au thread de lecture de s'arrêter proprement
+                self.serial_port = serial.Serial(self.port, self.baudrate, timeout=0.1 if self.threaded else None)
             except serial.SerialException:
                 print("Erreur : impossible d'ouvrir le port série.")
                 self.serial_port = None
 
+            self.decoder = BinaryFrameDecoder() if self.protocol == 'binary' else AsciiLineDecoder()
+            if self.serial_port and self.recorder:
+                self.recorder.open()
+            if self.serial_port and self.threaded:
+                self.buffer = SampleRingBuffer(self.buffer_size)
+                self.reader = SerialReaderThread(self.serial_port, self.buffer, self.decoder, self.recorder,
+                                                 self.SAMPLE_PERIODS[self.protocol])
+                self.reader.start()
+
     def read_values(self):
+        if self.reader:
+            # Dernier échantillon disponible, sans jamais bloquer la boucle Tk
+            sample = self.buffer.latest()
+            if sample is not None:
+                _, voltages = sample
+                return voltages[0], voltages[1]
+            return None, None
+
         if self.serial_port and self.serial_port.in_waiting > 0:
-            line = self.serial_port.readline().decode('utf-8').strip()
-            try:
-                voltages = list(map(float, line.split(',')))
-                if len(voltages) == 2:
-                    return voltages[0], voltages[1]
-            except ValueError:
-                print("Erreur : impossible de convertir les valeurs en float.")
-        # print("Erreur : impossible de lire les valeurs des batteries.")
+            # Tout ce qui est en attente passe par le décodeur (texte ou binaire), on garde l'échantillon le plus récent.
+            # Les lignes ou trames invalides sont comptées par le décodeur (stats()), pas affichées.
+            values = self.decoder.decode(self.serial_port.read(self.serial_port.in_waiting))
+            if len(values):
+                self.record(values)
+                return float(values[-1, 0]), float(values[-1, 1])
         return None, None
-    
+
+    def read_samples(self):
+        # Tous les échantillons reçus depuis le dernier appel : (horodatages, valeurs de forme (n, 2))
+        if self.reader:
+            return self.buffer.read_new()
+
+        player1_voltage, player2_voltage = self.read_values()
+        if player1_voltage is None or player2_voltage is None:
+            return np.empty(0), np.empty((0, 2))
+        return np.array([time.perf_counter()]), np.array([[player1_voltage, player2_voltage]])
+
+    def backlog(self):
+        # (octets pas encore lus sur le port, échantillons décodés pas encore consommés)
+        waiting = self.serial_port.in_waiting if self.serial_port else 0
+        return waiting, (self.buffer.backlog() if self.buffer and self.reader else 0)
+
+    def record(self, values):
+        if self.recorder:
+            self.recorder.write(np.full(len(values), time.perf_counter()), values)
+
+    def stats(self):
+        # Compteurs de trames perdues ou corrompues et d'échantillons écrasés dans le tampon
+        stats = self.decoder.stats() if self.decoder else {}
+        if self.buffer:
+            stats['overwritten'] = self.buffer.overwritten
+        return stats
+
     def close(self):
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
         if self.serial_port:
             self.serial_port.close()
             self.serial_port = None
+        if self.recorder:
+            self.recorder.close()
 
 class TestInput:
+    def __init__(self, players=2):
+        self.channels = players
+
     def read_values(self):
         # Générer des valeurs de test aléatoires
-        return random.uniform(0, 5), random.uniform(0, 5)
+        return tuple(random.uniform(0, 5) for _ in range(self.channels))
+
+    def read_samples(self):
+        return np.array([time.perf_counter()]), np.array([self.read_values()])
     
     def open(self):
         pass
@@ -76,45 +138,117 @@ class TestInput:
         pass
 
 class ElectricGame:
-    def __init__(self, root, test_mode=False, update_interval=10, game_duration=10, window_size_second=3):
+    def __init__(self, root, test_mode=False, update_interval=10, game_duration=10, window_size_second=3, render_interval=33,
+                 seed=None, scenario=None, scenario_dir='scenarios', serial_protocol='ascii',
+                 record_path=None, replay_path=None, replay_speed=1.0, instrumentation=False, metrics_log='volpil_metrics.log',
+                 leaderboard_path='leaderboard.bin', prewarm=True, print_timings=False,
+                 input_filters=None, players=None, ports=None, session_dir='sessions'):
         self.root = root
-        self.update_interval = update_interval
-        self.game_duration = game_duration
+        self.update_interval = update_interval  # Pas de simulation en millisecondes
+        self.render_interval = render_interval  # Intervalle de rendu en millisecondes
         self.window_size_second = window_size_second
         self.test_mode = test_mode
+        self.rng = np.random.default_rng(seed)  # Même graine, même courbe
+        self.scenario = scenario  # Nom d'un scénario précalculé, rejoué à l'identique pour chaque équipe
+        self.scenario_store = curveGenerator.ScenarioStore(scenario_dir)
         self.root.attributes('-fullscreen', True)
-        self.start_frame = tk.Frame(root, bg='white')
-        self.game_frame = None
-        self.battery1 = None
-        self.battery2 = None
-        self.update_batteries_flag = False
+        # Instrumentation optionnelle : surimpression (F3) et journal des compteurs de la boucle
+        self.metrics = Instrumentation(root, log_path=metrics_log) if instrumentation else None
+        # Écrans et images construits une seule fois puis réutilisés d'une partie à l'autre
+        self.assets = AssetCache(root)
+        self.screens = ScreenManager(root)
+        self.screens.register('start', self.build_start_screen)
+        self.screens.register('game', self.build_game_screen)
+        self.screens.register('end', self.build_end_screen)
+        self.batteries = []  # Batteries de l'écran affiché, une par joueur
+        self.loops = LoopManager(root)  # Toutes les boucles after passent par ici
         self.countdown_time = 3  # Temps pour le compte à rebours
+        self.countdown_label = None
         self.score_label = None  # Ajoutez ceci pour le score
-        self.scores = []  # Liste pour stocker les scores
-        self.score_history = []  # Historique des scores
-        self.input_handler = TestInput() if test_mode else SerialInput('/dev/cu.usbmodem1101')
-        self.player1_voltage = 0
-        self.player2_voltage = 0
+        self.leaderboard = Leaderboard(leaderboard_path)  # Classement persistant entre les redémarrages
+        # Chaque partie complète est archivée en colonnes pour l'analyse hors ligne (None pour désactiver)
+        self.session_log = SessionWriter(session_dir) if session_dir else None
+        if replay_path:
+            # Rejouer une session enregistrée à la place des dynamos
+            self.input_handler = ReplayInput(replay_path, speed=replay_speed)
+        elif test_mode:
+            self.input_handler = TestInput(players or 2)
+        elif ports:
+            # Plusieurs cartes (liste de ports ou 'auto') lues par un seul thread
+            self.input_handler = DeviceManager(ports, protocol=serial_protocol)
+        else:
+            recorder = SampleRecorder(record_path) if record_path else None
+            self.input_handler = SerialInput('/dev/cu.usbmodem1101', threaded=True, protocol=serial_protocol, recorder=recorder)
+        # Filtrage optionnel des entrées (FilterPipeline : médiane, EMA, étalonnage ADC -> watts)
+        self.input_filters = input_filters
+        if self.metrics and input_filters:
+            self.metrics.event('input_filters', **input_filters.latency_report())
+        # Nombre de joueurs : une voie d'entrée par joueur (deux par carte)
+        self.players = self.input_handler.channels
+        if players and players != self.players:
+            raise ValueError(f"{players} joueurs demandés, mais l'entrée fournit {self.players} voies")
+        self.voltages = [0.0] * self.players  # Dernière tension connue de chaque joueur
+        # Courbe, pas de simulation, tampons et score : la même logique tourne sans écran dans simulation.py
+        self.engine = GameEngine(self.players, update_interval, game_duration, rng=self.rng)
+        self.prewarm = prewarm  # Préparer l'écran de jeu pendant que l'écran d'accueil est inactif
+        self.startup_times = {}  # Mesures de démarrage en millisecondes (dernière valeur de chaque mesure)
+        self.print_timings = print_timings  # Afficher aussi les mesures de chaque partie sur la sortie standard
         self.show_start_screen()
+        self.root.after_idle(self.report_timing, 'premier affichage', PROCESS_START)
 
     def show_start_screen(self):
-        # Supprimer tous les widgets de l'écran de début avant de le réafficher
-        for widget in self.start_frame.winfo_children():
-            widget.destroy()
+        # Changement d'écran : arrêter toutes les boucles de l'écran précédent
+        self.loops.stop_all()
 
-        self.start_frame.pack(fill=tk.BOTH, expand=True)
         self.root.configure(bg='white')
+        self.screens.show('start')
+        self.batteries = self.start_batteries
+        self.log_screen_switch('start')
 
+        # Démarrer la boucle de dessin des batteries (seule consommatrice des entrées sur cet écran)
+        self.input_handler.open()
+        self.loops.start('input', self.update_batteries)
+
+        if self.prewarm and 'game' not in self.screens.frames:
+            self.warmup_steps = [self.warm_graph_import, self.warm_game_screen, self.warm_graph_render, self.warm_end_screen]
+            self.warmup_start = time.perf_counter()
+            self.loops.start('warmup', self.run_warmup_step, 100)
+
+    def run_warmup_step(self):
+        # Une étape par rappel pour laisser l'écran d'accueil réactif entre deux
+        if not self.warmup_steps:
+            self.report_timing('préchauffage', self.warmup_start)
+            return None
+        self.warmup_steps.pop(0)()
+        return 1
+
+    def warm_graph_import(self):
+        import graphDisplay  # Backend Tk de matplotlib
+
+    def warm_game_screen(self):
+        self.screens.frame('game')  # Construit l'écran de jeu (figure, batteries) sans l'afficher
+
+    def warm_graph_render(self):
+        self.graph.canvas.draw()  # Premier rendu Agg : charge le cache des polices
+
+    def warm_end_screen(self):
+        self.screens.frame('end')  # Redimensionne l'image de fin
+
+    def report_timing(self, name, start):
+        elapsed = (time.perf_counter() - start) * 1000
+        self.startup_times[name] = elapsed
+        if self.print_timings or name in BOOT_TIMINGS:
+            print(f"{name} : {elapsed:.0f} ms")
+        if self.metrics:
+            self.metrics.event('timing', name=name, ms=round(elapsed, 1))
+
+    def build_start_screen(self, frame):
         # Ajouter le logo en haut
-        logo_image = Image.open("./Splash_Volpil.png")
-        logo_image = logo_image.resize((244, 300))  # Redimensionner le logo si nécessaire
-        logo_photo = ImageTk.PhotoImage(logo_image)
-        logo_label = tk.Label(self.start_frame, image=logo_photo, bg='white')
-        logo_label.image = logo_photo  # Keep a reference to prevent garbage collection
+        logo_label = tk.Label(frame, image=self.assets.photo("./Splash_Volpil.png", (244, 300)), bg='white')
         logo_label.pack(pady=20)
 
         # Création d'un frame pour le contenu principal (texte + vidéo)
-        content_frame = tk.Frame(self.start_frame, bg='white')
+        content_frame = tk.Frame(frame, bg='white')
         content_frame.pack(expand=True, fill=tk.BOTH)
 
         # Ajouter le texte sur comment jouer (à gauche), en décalant à droite pour éviter la pile
@@ -126,75 +260,140 @@ class ElectricGame:
                                                   "maintenir l'équilibre!\n\n"
                                                   "Bonne chance et amusez-vous bien!",
                               font=("Montserrat", 24), bg='white', fg='black', justify=tk.LEFT)
-        text_label.pack(side=tk.LEFT, padx=(200, 200), pady=20)  # Décalage à droite
+        # Décalage pour laisser la place aux colonnes de batteries de chaque côté
+        padding = max(200, int(self.battery_margin() * frame.winfo_screenwidth()))
+        text_label.pack(side=tk.LEFT, padx=(padding, padding), pady=20)
 
         # Ajout des batteries pour l'entraînement
-        self.battery1 = BatteryDisplay(self.start_frame, relx=0.05, rely=0.65, anchor='center', label_text="Joueur 1")
-        self.battery2 = BatteryDisplay(self.start_frame, relx=0.95, rely=0.65, anchor='center', label_text="Joueur 2")
+        self.start_batteries = self.build_batteries(frame)
 
         # Affichage du bouton Jouer avec style
-        start_button = RoundedButton(self.start_frame, "Jouer !", self.start_game)
-
-        # Démarrer la boucle de dessin des batteries
-        self.update_batteries_flag = True
-        self.input_handler.open()
-        self.update_batteries()
+        RoundedButton(frame, "Jouer !", self.start_game)
+
+    def battery_margin(self):
+        # Largeur relative occupée par les colonnes de batteries d'un côté de l'écran (0.075 pour deux joueurs)
+        columns = (self.players + 1) // 2
+        return 0.05 + BATTERY_WIDTH / 2 + (columns - 1) * BATTERY_SPACING
+
+    def build_batteries(self, frame):
+        # Joueurs impairs à gauche, joueurs pairs à droite, en partant des bords de l'écran
+        batteries = []
+        for player in range(self.players):
+            offset = player // 2 * BATTERY_SPACING
+            relx = 0.05 + offset if player % 2 == 0 else 0.95 - offset
+            batteries.append(BatteryDisplay(frame, relx=relx, rely=0.65, anchor='center', label_text=f"Joueur {player + 1}"))
+        return batteries
+
+    def log_screen_switch(self, name):
+        if self.metrics:
+            self.metrics.event('screen_switch', screen=name, ms=round(self.screens.switch_times[name] * 1000, 2))
 
     def update_batteries(self):
+        if self.metrics:
+            self.metrics.callback_started()
+
         # Lecture des valeurs des batteries à partir de l'Arduino
-        player1_voltage, player2_voltage = self.input_handler.read_values()
+        with self.stage('input'):
+            voltages = self.read_latest()
+
+        if None not in voltages:
+            with self.stage('battery'):
+                for battery, voltage in zip(self.batteries, voltages):
+                    battery.draw_battery(voltage)
 
-        if player1_voltage is not None and player2_voltage is not None:
-            self.battery1.draw_battery(player1_voltage)
-            self.battery2.draw_battery(player2_voltage)
+        if self.metrics:
+            self.metrics.frame()
+            self.metrics.callback_scheduled(self.update_interval)
+            self.metrics.report(input_handler=self.input_handler)
 
-        # Répéter la mise à jour des batteries toutes les 500 ms
-        self.root.after(self.update_interval, self.update_batteries)
+        # Répéter la mise à jour des batteries à l'intervalle défini
+        return self.update_interval
+
+    def stage(self, name):
+        # Chronomètre d'étape, ou contexte vide quand l'instrumentation est désactivée
+        return self.metrics.stage(name) if self.metrics else NULL_STAGE
 
     def start_game(self):
+        start = time.perf_counter()
+
         # Arrêter la mise à jour des batteries
-        self.update_batteries_flag = False
+        self.loops.stop_all()
         self.input_handler.close()
         
         # Ouvrir le port série pour la lecture des valeurs des batteries
         self.input_handler.open()
 
-        self.start_frame.pack_forget()  # Cache l'écran de début
-        self.game_frame = tk.Frame(self.root, bg='white')
-        self.game_frame.pack(fill=tk.BOTH, expand=True)
-
-        # Initialisation des batteries et du graphique
-        self.battery1 = BatteryDisplay(self.game_frame, relx=0.05, rely=0.65, anchor='center', label_text="Joueur 1")
-        self.battery2 = BatteryDisplay(self.game_frame, relx=0.95, rely=0.65, anchor='center', label_text="Joueur 2")
-        self.graph = GraphDisplay(self.game_frame)
+        self.engine.reset(self.load_consumption_curve())
+        if self.input_filters:
+            self.input_filters.reset()
 
-        self.time = 0
-        total_points = int(self.game_duration * 1000 / self.update_interval)  # Nombre total de points pour la durée du jeu
-        self.consumption_values = self.generate_continuous_curve(total_points, 5, 10)
-        self.production_values = []
+        # Réafficher l'écran de jeu existant, seul son état est remis à zéro
+        self.screens.show('game')
+        self.batteries = self.game_batteries
+        self.graph.reset()
+        self.log_screen_switch('game')
 
-        # Créer le label de compte à rebours une seule fois
-        self.countdown_label = tk.Label(self.game_frame, font=("Arial", 100), bg='white', fg='black')
-        self.countdown_label.pack(side=tk.TOP, pady=25)  # Placer en haut de l'écran
-
-        # Créer le label pour le score
-        self.score_label = tk.Label(self.game_frame, font=("Arial", 40), bg='white', fg='black')
-        self.score_label.pack(side=tk.TOP)  # Placer juste en dessous du compte à rebours
+        # Le label de compte à rebours sert aussi d'indicateur : il vaut None une fois le décompte terminé
+        self.countdown_label = self.countdown_widget
+        self.countdown_label.pack(side=tk.TOP, pady=25, before=self.score_label)  # Placer en haut de l'écran
+        self.score_label.config(text="", fg='black')
 
         self.countdown_time = 3  # Initialiser le temps de compte à rebours
         self.countdown_label.config(text=f"{self.countdown_time}")  # Mettre à jour le texte du label
         self.countdown_time -= 1
+        self.root.after_idle(self.report_timing, 'bouton Jouer -> compte à rebours', start)
 
-        self.update()
+        # Démarrer l'horloge de jeu au moment où la partie commence
+        self.scheduler = FixedStepScheduler(self.update_interval, self.render_interval)
+        self.loops.start('input', self.update)
 
-    def update(self):
-        self.time += 1  # Incrémenter le temps en centièmes de seconde
-        elapsed_time = int(float(self.time) * float(self.update_interval) / 100)  # Temps écoulé en secondes
+    def build_game_screen(self, frame):
+        # Initialisation des batteries et du graphique (une seule figure pour toutes les parties)
+        self.game_batteries = self.build_batteries(frame)
+        # Import différé de matplotlib : il est normalement déjà fait par le préchauffage
+        from graphDisplay import GraphDisplay
+        # Échelle proportionnelle au nombre de joueurs ; le graphique se rétrécit pour ne pas recouvrir les batteries
+        self.graph = GraphDisplay(frame, ylim=6 * self.players, relwidth=1 - 2 * self.battery_margin())
+
+        # Label de compte à rebours
+        self.countdown_widget = tk.Label(frame, font=("Arial", 100), bg='white', fg='black')
+        self.countdown_widget.pack(side=tk.TOP, pady=25)  # Placer en haut de l'écran
+
+        # Créer le label pour le score
+        self.score_label = tk.Label(frame, font=("Arial", 40), bg='white', fg='black')
+        self.score_label.pack(side=tk.TOP)  # Placer juste en dessous du compte à rebours
 
-        if elapsed_time >= self.game_duration:  # Vérifier si le temps de jeu est écoulé
-            self.input_handler.close()
-            self.show_end_screen()
-            return
+    def update(self):
+        metrics = self.metrics
+        if metrics:
+            metrics.callback_started()
+
+        # Avancer la simulation à pas fixe pour rattraper l'horloge murale
+        steps = self.scheduler.due_steps()
+        for _ in range(steps):
+            if not self.simulation_step():
+                self.input_handler.close()
+                self.show_end_screen()
+                return None
+
+        # Le rendu tourne à sa propre cadence et saute les images en retard
+        if self.scheduler.render_due():
+            self.render_frame()
+            if metrics:
+                metrics.frame()
+
+        delay = self.scheduler.next_delay()
+        if metrics:
+            metrics.tick(steps)
+            metrics.callback_scheduled(delay)
+            metrics.report(self.scheduler.lag(), self.input_handler)
+        return delay  # Jusqu'au prochain pas ou rendu
+
+    def simulation_step(self):
+        engine = self.engine
+        if not engine.advance():  # Vérifier si le temps de jeu est écoulé
+            return False
+        elapsed_time = engine.elapsed()  # Temps de jeu écoulé en secondes
 
         # Gestion du compte à rebours
         if self.countdown_time > 0:
@@ -207,90 +406,65 @@ class ElectricGame:
             self.countdown_label.pack_forget()  # Retirer le compte à rebours
             self.countdown_label = None  # Supprimer la référence pour libérer la mémoire
 
-        # Lecture des valeurs des batteries à partir de l'Arduino
-        player1_voltage, player2_voltage = self.input_handler.read_values()
-        if player1_voltage is None or player2_voltage is None:
-            player1_voltage, player2_voltage = self.player1_voltage, self.player2_voltage
+        with self.stage('input'):
+            voltages = self.read_input()
+        index, production = engine.record(voltages)
 
-        if player1_voltage is not None and player2_voltage is not None:
-            self.player1_voltage = player1_voltage
-            self.player2_voltage = player2_voltage
-            self.battery1.draw_battery(player1_voltage)
-            self.battery2.draw_battery(player2_voltage)
+        # Calculer le score seulement après le compte à rebours
+        if engine.scoring():
+            with self.stage('scoring'):
+                self.update_score(index, production)
 
-            production = player1_voltage + player2_voltage
-            self.production_values.append(production)
+        return True
 
-            window_size = int(300 / self.update_interval)  # 3 secondes
+    def read_latest(self):
+        if not self.input_filters:
+            return self.input_handler.read_values()
 
-            # Définir les indices de début et de fin pour l'intervalle de 3 secondes autour du temps présent
-            start_index = max(0, self.time - window_size)
-            end_index = min(len(self.consumption_values) - 1, self.time + window_size)
+        # Tous les échantillons reçus depuis le dernier appel passent dans les filtres, on garde le plus récent
+        timestamps, values = self.input_handler.read_samples()
+        if not len(values):
+            return (None,) * self.players
+        _, filtered = self.input_filters.process(timestamps, values)
+        return tuple(filtered[-1].tolist())
 
-            # Extraire les valeurs de consommation et de production pour cet intervalle
-            consumption_values = self.consumption_values[start_index:end_index + 1]
-            production_values = self.production_values[start_index:end_index + 1]
+    def read_input(self):
+        # Lecture des valeurs des batteries à partir des cartes ; sans nouvel échantillon, on garde les précédentes
+        voltages = self.read_latest()
+        if None not in voltages:
+            self.voltages[:] = voltages
+        return self.voltages
 
-            # Ajuster les valeurs de l'axe des temps pour l'intervalle de 3 secondes
-            time_axis_values = [t * self.update_interval / 1000 for t in range(start_index, end_index + 1)]
+    def update_score(self, index, production):
+        self.engine.score(index, production, self.voltages)
 
-            # Mettre à jour le graphique avec les valeurs extraites
-            self.graph.update_graph(time_axis_values, consumption_values, production_values, self.time, window_size, self.update_interval)
+    def render_frame(self):
+        with self.stage('battery'):
+            for battery, voltage in zip(self.batteries, self.voltages):
+                battery.draw_battery(voltage)
 
-            # Calculer le score seulement après le compte à rebours
-            if not self.countdown_label:
-                current_consumption = consumption_values[-1] if consumption_values else 0
-                score = (production - current_consumption) / current_consumption * 100
+        window_size = int(self.window_size_second * 1000 / self.update_interval)  # Demi-fenêtre affichée, en pas
 
-                # Appliquer un malus ou calculer le score en fonction de la différence
-                if score < 0:  # Si le score est négatif (en dessous de la courbe de production)
-                    score *= -3  # Appliquer un malus de x3
+        # Définir les indices de début et de fin pour l'intervalle de 3 secondes autour du temps présent
+        engine = self.engine
+        start_index = max(0, engine.time - window_size)
+        end_index = min(engine.session.capacity - 1, engine.time + window_size)
 
-                # Stocker le score
-                self.scores.append(score)
+        # Vues (sans copie) sur le temps, la consommation et la production pour cet intervalle
+        time_axis_values, consumption_values, production_values = engine.session.window(start_index, end_index + 1)
 
-                # Mettre à jour le label de score
-                self.update_score_label(score)
+        # Mettre à jour le graphique avec les valeurs extraites
+        with self.stage('graph'):
+            self.graph.update_graph(time_axis_values, consumption_values, production_values, engine.time, window_size, self.update_interval)
 
-        self.root.after(self.update_interval, self.update)  # Mettre à jour selon l'intervalle défini
+        # Mettre à jour le label de score avec le dernier score calculé
+        if engine.current_score is not None:
+            self.update_score_label(engine.current_score)
+
+    def load_consumption_curve(self):
+        # Scénario précalculé mappé en mémoire, ou courbe générée par le moteur
+        return self.engine.consumption_curve(self.scenario_store, self.scenario)
 
-    def generate_continuous_curve(self, length, min_value, max_value, smoothness=0.3, min_plateau_duration=15, max_plateau_duration=30):
-        values = []
-        # Définir une valeur intermédiaire
-        mid_value = (min_value + max_value) / 2
-        
-        # Niveaux de plateaux possibles
-        plateau_values = [min_value, mid_value, max_value]
-        
-        # Initialisation de la valeur de départ
-        current_value = random.choice(plateau_values)
-        values.append(current_value)
-        
-        # Durée du plateau actuel (contrôlée par min et max)
-        plateau_duration = random.randint(min_plateau_duration, max_plateau_duration)
-        
-        for i in range(1, length):
-            # Vérifier si nous devons changer de plateau
-            if plateau_duration <= 0:
-                # Changer de plateau
-                next_value = random.choice(plateau_values)
-                
-                # Assurer que le prochain plateau est différent de l'actuel
-                while next_value == current_value:
-                    next_value = random.choice(plateau_values)
-                
-                current_value = next_value
-                # Redéfinir la durée du nouveau plateau
-                plateau_duration = random.randint(min_plateau_duration, max_plateau_duration)
-            
-            # Ajouter la valeur actuelle au résultat
-            values.append(current_value)
-            
-            # Décrémenter le compteur de durée du plateau
-            plateau_duration -= 1
-
-        return values
-    
     def update_score_label(self, score):
         # Mettre à jour le texte du label
         self.score_label.config(text=f"{score:.2f}%")
@@ -304,35 +478,62 @@ class ElectricGame:
             self.score_label.config(fg='red')  # Production inférieure à 100%
 
     def show_end_screen(self):
-        # Cache le jeu actuel
-        self.game_frame.pack_forget()
-
-        # Calculer le score final et l'historique
-        average_score = sum(self.scores) / len(self.scores) if self.scores else 0
-        self.score_history.append(average_score)
-
-        # Créer un nouvel écran de fin
-        end_frame = tk.Frame(self.root, bg='white')
-        end_frame.pack(fill=tk.BOTH, expand=True)
+        self.loops.stop_all()
+
+        # Le bilan est déjà calculé au fil de la partie : pas de nouveau passage sur les données
+        summary = self.engine.scorer.result()
+        if self.metrics and self.input_filters:
+            self.metrics.event('input_filters', **self.input_filters.latency_report())
+        average_score = summary['mean_score']
+        if summary['samples']:
+            player_ranking = self.leaderboard.add(average_score)
+        else:
+            player_ranking = None  # Aucun pas noté (consommation cible nulle) : la partie n'est pas classée
+        if self.session_log:
+            # Copie des tampons puis écriture en arrière-plan, avant que reset_game ne les vide
+            self.session_log.submit(self.engine.session, mean_score=average_score, rank=player_ranking,
+                                    update_interval=self.update_interval, scenario=self.scenario,
+                                    time_below=summary['time_below'], longest_deficit=summary['longest_deficit'])
+            if self.metrics:
+                self.metrics.event('session_log', **self.session_log.stats())
+
+        # Réafficher l'écran de fin existant
+        self.screens.show('end')
+        self.log_screen_switch('end')
+
+        shares = "   ".join(f"Joueur {player + 1} : {share * 100:.0f} %" for player, share in enumerate(summary['player_shares']))
+        score_text = f"{average_score:.2f}   Classement : {player_ranking}" if player_ranking else "-"
+        self.breakdown_label.config(text=f"Score : {score_text}\n"
+                                         f"Sous la courbe : {summary['time_below']:.1f} s ({summary['below_ratio'] * 100:.0f} %)   "
+                                         f"Plus long déficit : {summary['longest_deficit']:.1f} s\n"
+                                         f"{shares}")
+
+        # Afficher le haut du classement et les scores autour du joueur, avec un nombre fixe de labels
+        rows = self.leaderboard.entries(player_ranking or 0, LEADERBOARD_TOP, LEADERBOARD_RADIUS)
+        for score_entry, row in zip(self.score_entries, rows):
+            if row is None:
+                score_entry.config(text="...", fg="black")
+            else:
+                rank, score = row
+                score_color = "green" if rank == player_ranking else "black"  # Highlight le score actuel
+                score_entry.config(text=f"{rank}      {score:.2f}", fg=score_color)
+            score_entry.pack(pady=2, anchor="center")  # Centrer en Y
+        for score_entry in self.score_entries[len(rows):]:
+            score_entry.pack_forget()
 
+    def build_end_screen(self, end_frame):
         # Frame pour afficher le score et le classement au centre
         score_frame = tk.Frame(end_frame, bg='white')
         score_frame.pack(pady=20)
-
-        # Afficher le score final et le classement du joueur
-        scores_sorted = sorted(self.score_history, reverse=False)
-        player_ranking = scores_sorted.index(average_score) + 1  # +1 pour le classement humain
+        self.breakdown_label = tk.Label(score_frame, font=("Montserrat", 24), bg='white', fg='black')
+        self.breakdown_label.pack()
 
         # Frame gauche pour le texte explicatif
         left_frame = tk.Frame(end_frame, bg='white')
         left_frame.pack(side=tk.LEFT, padx=20, fill=tk.BOTH, expand=True)
 
         # Image de fin pour le texte détaillé
-        end_image = Image.open("./Volpil_Prof.png")
-        end_image = end_image.resize((233, 200))  # Redimensionner l'image si nécessaire
-        end_photo = ImageTk.PhotoImage(end_image)
-        end_label = tk.Label(left_frame, image=end_photo, bg='white')
-        end_label.image = end_photo  # Conserver une référence pour éviter la collecte des déchets
+        end_label = tk.Label(left_frame, image=self.assets.photo("./Volpil_Prof.png", (233, 200)), bg='white')
         end_label.pack(pady=10)
 
         # Texte détaillé sur les problèmes de flexibilité
@@ -355,27 +556,19 @@ class ElectricGame:
         scores_label.pack(pady=10)
 
         # Créer une zone pour afficher les scores
-        scores_display = tk.Frame(right_frame, bg='white')
-        scores_display.pack(pady=10)
-
-        # Afficher chaque score dans le tableau avec classement
-        for i, score in enumerate(scores_sorted):
-            score_color = "black"
-            if score == average_score:  # Highlight le score actuel
-                score_color = "green"  # Couleur pour mettre en surbrillance le score du joueur
-            score_entry = tk.Label(scores_display, text=f"{i + 1}      {score:.2f}", font=("Montserrat", 24), bg='white', fg=score_color)
-            score_entry.pack(pady=2, anchor="center")  # Centrer en Y
+        self.scores_display = tk.Frame(right_frame, bg='white')
+        self.scores_display.pack(pady=10)
+        # Haut du classement + séparateur + fenêtre autour du joueur
+        self.score_entries = [tk.Label(self.scores_display, font=("Montserrat", 24), bg='white')
+                              for _ in range(LEADERBOARD_TOP + 1 + 2 * LEADERBOARD_RADIUS + 1)]
 
         # Centrer le bouton Rejouer en bas
         restart_button_frame = tk.Frame(end_frame, bg='white')
         restart_button_frame.place(relx=0.5, rely=0.95, anchor="center")
 
-        restart_button = RoundedButton(restart_button_frame, "Rejouer", lambda: self.restart_game(end_frame))
-
-    def restart_game(self, end_frame):
-        # Cache l'écran de fin
-        end_frame.pack_forget()
+        RoundedButton(restart_button_frame, "Rejouer", self.restart_game)
 
+    def restart_game(self):
         # Réinitialiser le jeu
         self.reset_game()
 
@@ -384,21 +577,21 @@ class ElectricGame:
 
     def reset_game(self):
         # Réinitialiser les variables de jeu
-        self.time = 0
-        self.consumption_values = []
-        self.production_values = []
-        self.scores = []  # Réinitialiser les scores
+        self.engine.time = 0
+        if self.engine.session:
+            self.engine.session.clear()  # Réinitialiser la production et les scores sans réallouer
+        self.voltages = [0.0] * self.players
 
-        # Si les batteries sont présentes, redessiner
-        if self.battery1 and self.battery2:
-            self.battery1.draw_battery(0)
-            self.battery2.draw_battery(0)
+        # Remettre les batteries à zéro (elles sont réutilisées à la prochaine partie)
+        for battery in self.start_batteries + self.game_batteries:
+            battery.draw_battery(0)
 
-        # Si le graphique est présent, le réinitialiser
-        if hasattr(self, 'graph'):
-            self.graph.update_graph([], [], [], 0, 30, 10)  # Réinitialiser le graphique
+        # Le graphique est conservé, seules ses courbes sont vidées
+        self.graph.reset()
 
 if __name__ == "__main__":
     root = tk.Tk()
     game = ElectricGame(root, test_mode=False, update_interval=10, game_duration=60)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    if game.session_log:
+        game.session_log.close()  # Terminer l'écriture des dernières parties
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+import time
+import numpy as np
+
+# Fichier d'enregistrement : en-tête puis enregistrements de 16 octets ajoutés à la suite
+# (horodatage float64 en secondes depuis l'époque Unix, tension joueur 1 et joueur 2 en float32), petit-boutiste.
+MAGIC = b'VOLPREC1'
+RECORD_DTYPE = np.dtype([('timestamp', '<f8'), ('values', '<f4', 2)])
+SEGMENT_GAP = 1.0  # Au-delà de cet écart (s), deux échantillons appartiennent à deux sessions différentes
+
+class SampleRecorder:
+    # Enregistre chaque échantillon (horodatage, joueur 1, joueur 2) dans un fichier en ajout seul
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.samples = 0
+
+    def open(self):
+        if not self.file:
+            # Les horodatages reçus viennent de perf_counter, dont l'origine change à chaque lancement :
+            # ils sont ramenés à l'heure murale pour rester croissants d'une session à l'autre
+            self.clock_offset = time.time() - time.perf_counter()
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self.file = open(self.path, 'ab')
+            if new_file:
+                self.file.write(MAGIC)
+
+    def write(self, timestamps, values):
+        if not self.file or not len(values):
+            return
+        records = np.empty(len(values), dtype=RECORD_DTYPE)
+        records['timestamp'] = np.asarray(timestamps) + self.clock_offset
+        records['values'] = values
+        self.file.write(records.tobytes())
+        self.samples += len(records)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+def load_recording(path):
+    # Lecture en mémoire mappée, sans copier le fichier
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} n'est pas un enregistrement Volpil")
+    count = (os.path.getsize(path) - len(MAGIC)) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=len(MAGIC), shape=(count,))
+
+def relative_times(timestamps):
+    # Temps depuis le premier échantillon, toujours croissants. Un retour en arrière (anciens fichiers
+    # horodatés avec perf_counter) ou un long silence marque une nouvelle session : elle est recollée
+    # à la suite de la précédente, séparée d'une période d'échantillonnage typique.
+    times = np.asarray(timestamps, dtype=float)
+    if not len(times):
+        return times
+    steps = np.diff(times)
+    breaks = (steps < 0) | (steps > SEGMENT_GAP)
+    if breaks.any():
+        regular = steps[~breaks]
+        steps = np.where(breaks, np.median(regular) if len(regular) else 0.0, steps)
+    return np.concatenate(([0.0], np.cumsum(steps)))
+
+class ReplayInput:
+    # Rejoue un enregistrement avec la même interface que SerialInput.
+    # speed=1 : temps réel, speed>1 : accéléré, speed=None : un échantillon par lecture, aussi vite que possible.
+    channels = 2  # Joueur 1 et joueur 2, comme SampleRecorder
+    def __init__(self, path, speed=1.0, loop=False):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.records = None
+        self.cursor = 0
+        self.start_time = None
+
+    def open(self):
+        if self.records is None:
+            records = load_recording(self.path)
+            self.times = relative_times(records['timestamp'])
+            self.values = records['values']
+            self.records = records
+        self.cursor = 0
+        self.start_time = time.perf_counter()
+
+    def available(self):
+        # Indice (exclu) du dernier échantillon « arrivé » à l'instant présent
+        if not self.speed:
+            return min(self.cursor + 1, len(self.values))
+        elapsed = (time.perf_counter() - self.start_time) * self.speed
+        if self.loop and len(self.times) and elapsed > self.times[-1]:
+            self.cursor = 0
+            self.start_time = time.perf_counter()
+            elapsed = 0
+        return int(np.searchsorted(self.times, elapsed, side='right'))
+
+    def finished(self):
+        return self.records is not None and self.cursor >= len(self.values)
+
+    def read_values(self):
+        if self.records is None:
+            return None, None
+        end = self.available()
+        if end <= self.cursor:
+            return None, None
+        self.cursor = end
+        return float(self.values[end - 1, 0]), float(self.values[end - 1, 1])
+
+    def read_samples(self):
+        if self.records is None:
+            return np.empty(0), np.empty((0, 2))
+        start, end = self.cursor, max(self.available(), self.cursor)
+        self.cursor = end
+        return self.times[start:end], np.asarray(self.values[start:end], dtype=float)
+
+    def stats(self):
+        return {'replayed': self.cursor}
+
+    def close(self):
+        self.records = None
@@ -1,41 +1,47 @@
 import tkinter as tk
+from PIL import Image, ImageDraw, ImageTk
+
+REFERENCE_HEIGHT = 1080  # Hauteur d'écran pour laquelle le bouton a été dessiné (200x60)
+SUPERSAMPLING = 4  # Dessin agrandi puis réduit pour des bords arrondis lissés
 
 class RoundedButton:
-    def __init__(self, parent, text, command):
+    # Fonds de bouton déjà dessinés, partagés par tous les boutons : (interpréteur Tk, largeur, hauteur, rayon, couleur) -> image.
+    # Une PhotoImage n'existe que dans l'interpréteur qui l'a créée (plusieurs Tk() successifs dans benchmark.py).
+    image_cache = {}
+
+    def __init__(self, parent, text, command, width=200, height=60, radius=15, button_color="#8675BA"):
         self.parent = parent
         self.text = text
         self.command = command
 
+        # Taille calculée une fois d'après la résolution de l'écran : identique en 1080p, doublée en 4K
+        scale = max(parent.winfo_screenheight() / REFERENCE_HEIGHT, 1)
+        self.width, self.height, self.radius = round(width * scale), round(height * scale), round(radius * scale)
+
         # Créer un canvas pour dessiner le bouton
-        self.canvas = tk.Canvas(parent, width=200, height=60, bg='white', highlightthickness=0)
+        self.canvas = tk.Canvas(parent, width=self.width, height=self.height, bg='white', highlightthickness=0)
         self.canvas.pack(pady=20, side=tk.BOTTOM, anchor="center")
 
-        # Dessiner le bouton avec des bords arrondis
-        self.draw_button()
+        # Dessiner le bouton avec des bords arrondis : une seule image au lieu de sept primitives
+        self.image_id = self.canvas.create_image(0, 0, image=self.button_image(button_color), anchor='nw')
 
         # Ajouter le texte sur le bouton
-        self.text_id = self.canvas.create_text(100, 30, text=self.text, fill='white', font=("Montserrat", 20))
+        self.text_id = self.canvas.create_text(self.width / 2, self.height / 2, text=self.text, fill='white',
+                                               font=("Montserrat", round(20 * scale)))
 
         # Lier le clic sur le bouton à la fonction de commande
         self.canvas.bind("<Button-1>", self.on_click)
 
-    def draw_button(self):
-        # Couleurs
-        button_color = "#8675BA"  # Couleur principale du bouton
-        radius = 15  # Rayon des coins arrondis
-
-        # Dessiner les coins arrondis
-        self.canvas.create_arc(0, 0, radius * 2, radius * 2, start=90, extent=90, fill=button_color, outline="")
-        self.canvas.create_arc(200 - radius * 2, 0, 200, radius * 2, start=0, extent=90, fill=button_color, outline="")
-        self.canvas.create_arc(0, 60 - radius * 2, radius * 2, 60, start=180, extent=90, fill=button_color, outline="")
-        self.canvas.create_arc(200 - radius * 2, 60 - radius * 2, 200, 60, start=270, extent=90, fill=button_color, outline="")
-
-        # Dessiner le grand rectangle entre les arcs
-        self.canvas.create_rectangle(radius, 0, 200 - radius + 1, 60, fill=button_color, outline="")
-        
-        # Dessiner les petits rectangles entre les arcs et les bords
-        self.canvas.create_rectangle(0, radius, radius, 60 - radius + 1, fill=button_color, outline="")
-        self.canvas.create_rectangle(200 - radius, radius, 200, 60 - radius + 1, fill=button_color, outline="")
+    def button_image(self, button_color):
+        key = (self.canvas.tk, self.width, self.height, self.radius, button_color)
+        if key not in RoundedButton.image_cache:
+            factor = SUPERSAMPLING
+            image = Image.new('RGBA', (self.width * factor, self.height * factor), (0, 0, 0, 0))
+            ImageDraw.Draw(image).rounded_rectangle((0, 0, self.width * factor - 1, self.height * factor - 1),
+                                                    radius=self.radius * factor, fill=button_color)
+            image = image.resize((self.width, self.height), Image.LANCZOS)
+            RoundedButton.image_cache[key] = ImageTk.PhotoImage(image, master=self.canvas)
+        return RoundedButton.image_cache[key]
 
     def on_click(self, event):
-        self.command()  # Appeler la commande associée
\ No newline at end of file
+        self.command()  # Appeler la commande associée
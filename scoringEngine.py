@@ -0,0 +1,92 @@
+from collections import deque
+import math
+
+def tick_score(production, consumption, malus=3):
+    # Écart relatif en % à la consommation ; en dessous de la courbe, l'écart est multiplié par le malus.
+    # Sans consommation cible, l'écart relatif n'est pas défini : NaN (0 serait un score parfait).
+    if consumption <= 0:
+        return math.nan
+    score = (production - consumption) / consumption * 100
+    if score < 0:  # Si le score est négatif (en dessous de la courbe de production)
+        score *= -malus  # Appliquer un malus
+    return score
+
+class StreamingScorer:
+    # Statistiques de score mises à jour en O(1) à chaque échantillon :
+    # moyenne et écart-type (Welford), erreur sur une fenêtre glissante, temps sous la courbe,
+    # plus long déficit et part de production de chaque joueur.
+    def __init__(self, players=2, window=100, step_seconds=0.01, malus=3):
+        self.players = players
+        self.window = window  # Taille de la fenêtre glissante en échantillons
+        self.step_seconds = step_seconds  # Durée représentée par un échantillon
+        self.malus = malus
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Somme des carrés des écarts à la moyenne (Welford)
+        self.abs_error_total = 0.0
+        self.recent_errors = deque()
+        self.recent_error_sum = 0.0
+        self.below_count = 0
+        self.streak = 0
+        self.longest_streak = 0
+        self.player_totals = [0.0] * self.players
+        self.production_total = 0.0
+
+    def add(self, production, consumption, voltages=()):
+        score = tick_score(production, consumption, self.malus)
+        if math.isnan(score):
+            return score  # Pas non noté : il n'entre dans aucune statistique
+
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+
+        # Erreur absolue (W), globale et sur la fenêtre glissante
+        error = abs(production - consumption)
+        self.abs_error_total += error
+        self.recent_errors.append(error)
+        self.recent_error_sum += error
+        if len(self.recent_errors) > self.window:
+            self.recent_error_sum -= self.recent_errors.popleft()
+
+        # Temps passé sous la courbe et plus longue série de déficit
+        if production < consumption:
+            self.below_count += 1
+            self.streak += 1
+            if self.streak > self.longest_streak:
+                self.longest_streak = self.streak
+        else:
+            self.streak = 0
+
+        for player, voltage in enumerate(voltages):
+            self.player_totals[player] += voltage
+        self.production_total += production
+        return score
+
+    def rolling_error(self):
+        return self.recent_error_sum / len(self.recent_errors) if self.recent_errors else 0.0
+
+    def result(self):
+        shares = [total / self.production_total if self.production_total else 0.0 for total in self.player_totals]
+        return {
+            'samples': self.count,
+            'mean_score': self.mean if self.count else math.nan,  # Aucun pas noté : score non défini
+            'score_std': math.sqrt(self.m2 / self.count) if self.count else 0.0,
+            'mean_error': self.abs_error_total / self.count if self.count else 0.0,
+            'rolling_error': self.rolling_error(),
+            'time_below': self.below_count * self.step_seconds,
+            'below_ratio': self.below_count / self.count if self.count else 0.0,
+            'longest_deficit': self.longest_streak * self.step_seconds,
+            'player_shares': shares,
+        }
+
+def score_run(production, consumption, voltages, **scorer_options):
+    # Rejoue le moteur sur une partie complète (enregistrement, SessionBuffer...) et renvoie son bilan
+    scorer = StreamingScorer(players=len(voltages[0]) if len(voltages) else 2, **scorer_options)
+    for sample_production, sample_consumption, sample_voltages in zip(production, consumption, voltages):
+        scorer.add(float(sample_production), float(sample_consumption), sample_voltages.tolist())
+    return scorer.result()
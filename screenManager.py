@@ -0,0 +1,48 @@
+from time import perf_counter
+import tkinter as tk
+from PIL import Image, ImageTk
+
+class AssetCache:
+    # Images ouvertes et redimensionnées une seule fois, conservées comme PhotoImage
+    def __init__(self, root):
+        self.root = root
+        self.photos = {}
+
+    def photo(self, path, size):
+        key = (path, size)
+        if key not in self.photos:
+            with Image.open(path) as image:
+                self.photos[key] = ImageTk.PhotoImage(image.resize(size), master=self.root)
+        return self.photos[key]
+
+class ScreenManager:
+    # Chaque écran est construit une seule fois (à la première demande), puis seulement affiché ou masqué
+    def __init__(self, root):
+        self.root = root
+        self.builders = {}
+        self.frames = {}
+        self.current = None
+        self.switch_times = {}  # Nom de l'écran -> durée du dernier changement d'écran (s)
+
+    def register(self, name, builder):
+        self.builders[name] = builder
+
+    def frame(self, name):
+        if name not in self.frames:
+            frame = tk.Frame(self.root, bg='white')
+            self.builders[name](frame)
+            self.frames[name] = frame
+        return self.frames[name]
+
+    def show(self, name):
+        start = perf_counter()
+        if self.current and self.current != name:
+            self.frames[self.current].pack_forget()
+        frame = self.frame(name)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.current = name
+
+        # Inclure la mise en page Tk dans la mesure : c'est elle qui coûte lors d'un changement d'écran
+        self.root.update_idletasks()
+        self.switch_times[name] = perf_counter() - start
+        return frame
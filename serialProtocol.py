@@ -0,0 +1,125 @@
+import numpy as np
+
+ADC_MAX = 1023  # Convertisseur 10 bits de l'Arduino
+ADC_REFERENCE = 5.0  # Tension de référence en volts
+
+# Trame binaire (petit-boutiste, 9 octets) :
+#   0xA5 0x5A | numéro de séquence (uint16) | ADC joueur 1 (uint16) | ADC joueur 2 (uint16) | somme de contrôle (uint8)
+# La somme de contrôle est la somme des 6 octets entre la synchronisation et elle-même, modulo 256.
+SYNC = b'\xa5\x5a'
+FRAME_SIZE = 9
+FRAME_DTYPE = np.dtype([('sync', 'u1', 2), ('seq', '<u2'), ('adc', '<u2', 2), ('checksum', 'u1')])
+# Au-delà de cet écart (2 s à 500 Hz), un saut de séquence n'est plus une perte mais une carte redémarrée
+MAX_SEQUENCE_GAP = 1000
+
+def adc_to_volts(counts):
+    return np.asarray(counts, dtype=float) * (ADC_REFERENCE / ADC_MAX)
+
+class AsciiLineDecoder:
+    # Protocole historique : "1.23,4.56\n" par échantillon
+    def __init__(self):
+        self.pending = b''
+        self.malformed = 0
+
+    def decode(self, data):
+        self.pending += data
+        *lines, self.pending = self.pending.split(b'\n')
+        values = []
+        for line in lines:
+            voltages = self.parse_line(line)
+            if voltages is None:
+                self.malformed += 1
+            else:
+                values.append(voltages)
+        return np.array(values, dtype=float).reshape(-1, 2)
+
+    @staticmethod
+    def parse_line(line):
+        try:
+            voltages = list(map(float, line.decode('utf-8').strip().split(',')))
+        except (UnicodeDecodeError, ValueError):
+            return None
+        if len(voltages) == 2:
+            return voltages[0], voltages[1]
+        return None
+
+    def stats(self):
+        return {'malformed': self.malformed}
+
+class BinaryFrameDecoder:
+    # Décodage par lots de trames de taille fixe ; les trames corrompues et perdues sont comptées, pas affichées
+    def __init__(self, raw_counts=False):
+        self.raw_counts = raw_counts  # Renvoyer les comptes ADC bruts plutôt que des volts
+        self.pending = b''
+        self.last_seq = None
+        self.frames = 0
+        self.corrupt_frames = 0  # Trames rejetées (diagnostic) : elles sont aussi comprises dans dropped_frames
+        self.dropped_frames = 0  # Trames perdues, déduites des trous de numéro de séquence (corrompues comprises)
+        self.resyncs = 0  # Numéro répété ou saut aberrant (carte redémarrée) : la séquence repart de là
+        self.skipped_bytes = 0
+
+    def decode(self, data):
+        buffer = self.pending + data
+        batches = []
+        position = 0
+        while True:
+            start = buffer.find(SYNC, position)
+            if start < 0:
+                # Garder un éventuel premier octet de synchronisation coupé en fin de lecture
+                end = len(buffer) - 1 if buffer.endswith(SYNC[:1]) else len(buffer)
+                self.skipped_bytes += end - position
+                position = end
+                break
+            self.skipped_bytes += start - position
+
+            count = (len(buffer) - start) // FRAME_SIZE
+            if count == 0:
+                position = start
+                break
+
+            raw = np.frombuffer(buffer, dtype=np.uint8, count=count * FRAME_SIZE, offset=start).reshape(count, FRAME_SIZE)
+            valid = (raw[:, 0] == SYNC[0]) & (raw[:, 1] == SYNC[1])
+            valid &= (raw[:, 2:8].sum(axis=1) & 0xFF) == raw[:, 8]
+
+            # On garde le préfixe de trames valides, puis on se resynchronise après la première invalide
+            invalid = np.flatnonzero(~valid)
+            good = count if len(invalid) == 0 else int(invalid[0])
+            if good:
+                batches.append(raw[:good].copy().view(FRAME_DTYPE).reshape(good))
+            position = start + good * FRAME_SIZE
+            if good == count:
+                break
+            self.corrupt_frames += 1
+            position += 1
+
+        self.pending = buffer[position:]
+        if not batches:
+            return np.empty((0, 2))
+
+        frames = np.concatenate(batches)
+        self.count_dropped(frames['seq'])
+        self.frames += len(frames)
+        if self.raw_counts:
+            return frames['adc'].astype(float)
+        return adc_to_volts(frames['adc'])
+
+    def count_dropped(self, sequence):
+        sequence = sequence.astype(np.int64)
+        if self.last_seq is not None:
+            sequence = np.concatenate(([self.last_seq], sequence))
+        # Écart de numéro de séquence (modulo 2^16) moins un = trames perdues.
+        # Un écart nul (numéro répété) ou trop grand (redémarrage de la carte) est une resynchronisation.
+        steps = np.diff(sequence) % 65536
+        resync = (steps == 0) | (steps > MAX_SEQUENCE_GAP)
+        self.resyncs += int(np.count_nonzero(resync))
+        self.dropped_frames += int((steps[~resync] - 1).sum())
+        self.last_seq = int(sequence[-1])
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'corrupt_frames': self.corrupt_frames,
+            'dropped_frames': self.dropped_frames,
+            'resyncs': self.resyncs,
+            'skipped_bytes': self.skipped_bytes,
+        }
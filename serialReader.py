@@ -0,0 +1,111 @@
+import threading
+import time
+import numpy as np
+
+class SampleRingBuffer:
+    # Tampon circulaire de taille fixe, horodaté.
+    # Un seul producteur (le thread de lecture) et un seul consommateur (la boucle Tk) :
+    # le producteur écrit l'échantillon puis publie l'indice d'écriture, aucun verrou n'est nécessaire.
+    def __init__(self, capacity=4096, channels=2):
+        self.capacity = capacity
+        self.channels = channels
+        self.timestamps = np.zeros(capacity)
+        self.values = np.zeros((capacity, channels))
+        self.write_index = 0  # Nombre total d'échantillons publiés
+        self.read_index = 0  # Nombre total d'échantillons consommés
+        self.overwritten = 0  # Échantillons écrasés avant d'avoir été lus
+
+    def push(self, timestamp, values):
+        slot = self.write_index % self.capacity
+        self.timestamps[slot] = timestamp
+        self.values[slot] = values
+        self.write_index += 1  # Publication après écriture complète
+
+    def push_many(self, timestamps, values):
+        # Écriture d'un lot en au plus deux copies (avant et après le bouclage du tampon)
+        count = len(values)
+        if count > self.capacity:
+            self.write_index += count - self.capacity
+            timestamps, values = timestamps[-self.capacity:], values[-self.capacity:]
+            count = self.capacity
+        slot = self.write_index % self.capacity
+        first = min(count, self.capacity - slot)
+        self.timestamps[slot:slot + first] = timestamps[:first]
+        self.values[slot:slot + first] = values[:first]
+        self.timestamps[:count - first] = timestamps[first:]
+        self.values[:count - first] = values[first:]
+        self.write_index += count  # Publication après écriture complète
+
+    def latest(self):
+        # Renvoie le dernier échantillon publié, ou None si rien de nouveau depuis la dernière lecture
+        write_index = self.write_index
+        if write_index == self.read_index:
+            return None
+        self.skip_to(write_index)
+        slot = (write_index - 1) % self.capacity
+        return float(self.timestamps[slot]), tuple(self.values[slot].tolist())
+
+    def read_new(self):
+        # Renvoie tous les échantillons publiés depuis la dernière lecture (copies, ordre chronologique)
+        write_index = self.write_index
+        start = self.skip_to(write_index)
+        indices = np.arange(start, write_index)
+        timestamps = self.timestamps[indices % self.capacity]
+        values = self.values[indices % self.capacity]
+
+        # Le producteur a pu reprendre de l'avance pendant la copie : on écarte les cases réécrites
+        lapped = self.write_index - self.capacity
+        if lapped > start:
+            keep = indices >= lapped
+            self.overwritten += int(np.count_nonzero(~keep))
+            timestamps, values = timestamps[keep], values[keep]
+        return timestamps, values
+
+    def skip_to(self, write_index):
+        start = self.read_index
+        if write_index - start > self.capacity:
+            self.overwritten += write_index - start - self.capacity
+            start = write_index - self.capacity
+        self.read_index = write_index
+        return start
+
+    def backlog(self):
+        return self.write_index - self.read_index
+
+class SerialReaderThread(threading.Thread):
+    # Vide le port série en continu hors du thread Tk et publie chaque échantillon décodé dans le tampon
+    def __init__(self, serial_port, buffer, decoder, recorder=None, sample_period=None):
+        super().__init__(daemon=True)
+        self.sample_period = sample_period  # Période nominale : horodatage individuel des échantillons d'un même lot
+        self.serial_port = serial_port
+        self.buffer = buffer
+        self.decoder = decoder
+        self.recorder = recorder  # Enregistrement optionnel de chaque échantillon reçu
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                # Lecture bornée par le timeout du port : le thread reste réactif à l'arrêt
+                chunk = self.serial_port.read(self.serial_port.in_waiting or 1)
+            except (OSError, TypeError):  # serial.SerialException dérive d'OSError
+                break
+            if not chunk:
+                continue
+
+            now = time.perf_counter()
+            values = self.decoder.decode(chunk)
+            if len(values):
+                if self.sample_period:
+                    # Le dernier échantillon vient d'arriver, les précédents sont espacés d'une période
+                    timestamps = now - np.arange(len(values) - 1, -1, -1) * self.sample_period
+                else:
+                    timestamps = np.full(len(values), now)
+                self.buffer.push_many(timestamps, values)
+                if self.recorder:
+                    self.recorder.write(timestamps, values)
+
+    def stop(self):
+        self.stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=1)
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import numpy as np
+from sessionLog import INDEX_FILE
+
+# Analyse hors ligne des parties enregistrées par SessionWriter.
+# Chaque partie est mappée en mémoire ; les calculs sont vectorisés sur la partie entière.
+
+def load_index(directory='sessions'):
+    entries = []
+    path = os.path.join(directory, INDEX_FILE)
+    if not os.path.exists(path):
+        return entries
+    with open(path) as index:
+        for line in index:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                pass  # Ligne tronquée (arrêt brutal pendant l'écriture)
+    return entries
+
+def load_round(directory, entry):
+    # Tableau (échantillons, colonnes) en lecture seule, sans copie en mémoire
+    return np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+
+def next_true(mask):
+    # Pour chaque indice i, le premier indice j >= i où mask est vrai (len(mask) s'il n'y en a pas)
+    positions = np.where(mask, np.arange(len(mask)), len(mask))
+    return np.minimum.accumulate(positions[::-1])[::-1]
+
+def round_metrics(columns, step_seconds, tolerance=0.1):
+    # Temps de réaction à chaque changement de plateau et dépassement une fois le plateau atteint
+    consumption = np.asarray(columns[:, 1], dtype=float)
+    production = np.asarray(columns[:, 2], dtype=float)
+    scores = np.asarray(columns[:, 3], dtype=float)
+
+    # On ignore le compte à rebours (scores NaN) : les joueurs ne jouent pas encore
+    active = np.flatnonzero(~np.isnan(scores))
+    if not len(active):
+        return {'reaction': np.empty(0), 'overshoot': np.empty(0), 'missed': 0}
+    consumption = consumption[active[0]:]
+    production = production[active[0]:]
+
+    relative = np.divide(production - consumption, consumption, out=np.zeros(len(consumption)), where=consumption > 0)
+    starts = np.flatnonzero(np.diff(consumption)) + 1
+    if not len(starts):
+        return {'reaction': np.empty(0), 'overshoot': np.empty(0), 'missed': 0}
+    ends = np.append(starts[1:], len(consumption))
+
+    # Premier échantillon à moins de tolerance de la nouvelle cible, dans le plateau
+    reached = next_true(np.abs(relative) <= tolerance)[starts]
+    hit = reached < ends
+
+    # Dépassement : plus grand surplus relatif entre le moment où la cible est atteinte et la fin du plateau
+    segment = np.searchsorted(starts, np.arange(len(consumption)), side='right') - 1
+    after_reach = (segment >= 0) & (np.arange(len(consumption)) >= np.where(segment >= 0, reached[segment], 0))
+    surplus = np.where(after_reach, relative, -np.inf)
+    overshoot = np.maximum.reduceat(surplus, starts)
+
+    return {
+        'reaction': (reached[hit] - starts[hit]) * step_seconds,
+        'overshoot': np.maximum(overshoot[hit], 0),
+        'missed': int(np.count_nonzero(~hit)),
+    }
+
+def percentiles(values):
+    if not len(values):
+        return {'count': 0}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {'count': len(values), 'mean': float(np.mean(values)), 'p50': float(p50), 'p90': float(p90), 'p99': float(p99)}
+
+def aggregate(directory='sessions', tolerance=0.1, players=None):
+    # Statistiques de toutes les parties (éventuellement filtrées par nombre de joueurs)
+    entries = [entry for entry in load_index(directory) if players is None or entry['players'] == players]
+    reactions, overshoots, missed = [], [], 0
+    for entry in entries:
+        try:
+            columns = load_round(directory, entry)
+        except (OSError, ValueError):
+            continue
+        metrics = round_metrics(columns, entry.get('update_interval', 10) / 1000, tolerance)
+        reactions.append(metrics['reaction'])
+        overshoots.append(metrics['overshoot'])
+        missed += metrics['missed']
+
+    scores = np.array([entry['mean_score'] for entry in entries if 'mean_score' in entry], dtype=float)
+    scores = scores[~np.isnan(scores)]  # Parties sans pas noté
+    return {
+        'rounds': len(entries),
+        'score': percentiles(scores),
+        'reaction_s': percentiles(np.concatenate(reactions) if reactions else np.empty(0)),
+        'overshoot': percentiles(np.concatenate(overshoots) if overshoots else np.empty(0)),
+        'missed_plateaus': missed,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Statistiques sur les parties enregistrées")
+    parser.add_argument('--directory', default='sessions')
+    parser.add_argument('--tolerance', type=float, default=0.1, help="Écart relatif considéré comme plateau atteint")
+    parser.add_argument('--players', type=int, help="Ne garder que les parties avec ce nombre de joueurs")
+    args = parser.parse_args()
+
+    print(json.dumps(aggregate(args.directory, args.tolerance, args.players), indent=2))
@@ -0,0 +1,47 @@
+import numpy as np
+
+class SessionBuffer:
+    # Données d'une partie dans des tableaux préalloués : aucune allocation par pas de simulation,
+    # les fenêtres affichées sont des vues sans copie et la partie complète reste disponible à la fin.
+    def __init__(self, total_points, update_interval, players=2):
+        self.capacity = total_points
+        self.players = players
+        self.time = np.arange(total_points) * update_interval / 1000  # Axe des temps en secondes
+        self.consumption = np.zeros(total_points)
+        self.production = np.zeros(total_points)
+        self.voltages = np.zeros((total_points, players))
+        self.scores = np.full(total_points, np.nan)  # NaN tant que le score n'est pas calculé (compte à rebours)
+        self.length = 0  # Nombre de pas enregistrés
+
+    def reset(self, consumption):
+        # Nouvelle partie : la courbe cible est copiée dans le tampon existant
+        count = min(len(consumption), self.capacity)
+        self.consumption[:count] = consumption[:count]
+        self.consumption[count:] = consumption[-1] if count else 0
+        self.clear()
+
+    def clear(self):
+        self.production[:self.length] = 0
+        self.voltages[:self.length] = 0
+        self.scores[:self.length] = np.nan
+        self.length = 0
+
+    def append(self, voltages, production):
+        if self.length >= self.capacity:
+            return None
+        index = self.length
+        self.voltages[index] = voltages
+        self.production[index] = production
+        self.length += 1
+        return index
+
+    def set_score(self, index, score):
+        self.scores[index] = score
+
+    def window(self, start, end):
+        # Vues sur [start, end) : la production s'arrête au dernier pas enregistré
+        return self.time[start:end], self.consumption[start:end], self.production[start:min(end, self.length)]
+
+    def recorded_scores(self):
+        scores = self.scores[:self.length]
+        return scores[~np.isnan(scores)]
@@ -0,0 +1,85 @@
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+# Journal des parties : une partie = un fichier .npy en colonnes (ordre Fortran : chaque colonne est contiguë),
+# rangé dans un dossier par jour, plus une ligne de métadonnées dans index.jsonl.
+# Colonnes : temps (s), consommation, production, score, puis la tension de chaque joueur.
+BASE_COLUMNS = ('time', 'consumption', 'production', 'score')
+INDEX_FILE = 'index.jsonl'
+
+def column_names(players):
+    return BASE_COLUMNS + tuple(f'player{player + 1}' for player in range(players))
+
+class SessionWriter:
+    # Écriture sur disque dans un thread dédié : la boucle de jeu ne fait qu'une copie des tampons.
+    def __init__(self, directory='sessions', max_pending=16):
+        self.directory = directory
+        self.queue = queue.Queue(max_pending)
+        self.thread = None
+        self.written = 0
+        self.dropped = 0  # Parties perdues parce que la file était pleine (disque trop lent)
+        self.errors = 0
+        self.write_time = 0.0  # Temps passé à écrire, côté thread
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def submit(self, session, **metadata):
+        # Copie des données de la partie : le SessionBuffer est réutilisé dès la partie suivante
+        length = session.length
+        columns = np.empty((length, len(BASE_COLUMNS) + session.players), dtype=np.float32, order='F')
+        columns[:, 0] = session.time[:length]
+        columns[:, 1] = session.consumption[:length]
+        columns[:, 2] = session.production[:length]
+        columns[:, 3] = session.scores[:length]
+        columns[:, 4:] = session.voltages[:length]
+        metadata.setdefault('timestamp', time.time())
+        metadata['players'] = session.players
+        metadata['samples'] = length
+        self.start()
+        try:
+            self.queue.put_nowait((columns, metadata))
+        except queue.Full:
+            self.dropped += 1
+            print("Erreur : journal des parties en retard, partie non enregistrée.")
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            start = time.perf_counter()
+            try:
+                self.write(*item)
+                self.written += 1
+            except OSError as error:
+                self.errors += 1
+                print(f"Erreur : impossible d'écrire la partie ({error}).")
+            self.write_time += time.perf_counter() - start
+
+    def write(self, columns, metadata):
+        day = time.strftime('%Y%m%d', time.localtime(metadata['timestamp']))
+        os.makedirs(os.path.join(self.directory, day), exist_ok=True)
+        name = time.strftime('%H%M%S', time.localtime(metadata['timestamp']))
+        path = os.path.join(day, f'round_{name}_{int(metadata["timestamp"] * 1000) % 1000:03d}.npy')
+        np.save(os.path.join(self.directory, path), columns)
+        # L'index n'est complété qu'une fois le fichier écrit : une ligne = une partie lisible
+        with open(os.path.join(self.directory, INDEX_FILE), 'a') as index:
+            index.write(json.dumps(dict(metadata, file=path, columns=column_names(metadata['players']))) + '\n')
+
+    def stats(self):
+        return {'written': self.written, 'pending': self.queue.qsize(), 'dropped': self.dropped,
+                'errors': self.errors, 'write_ms': self.write_time * 1000}
+
+    def close(self, timeout=5):
+        # Vide la file avant de quitter
+        if self.thread:
+            self.queue.put(None)
+            self.thread.join(timeout)
+            self.thread = None
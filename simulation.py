@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+import numpy as np
+from gameEngine import GameEngine
+from replayInput import ReplayInput, load_recording, relative_times
+from scoringEngine import score_run
+
+# Parties simulées sans Tk, aussi vite que possible, avec des joueurs automatiques.
+# Même GameEngine qu'ElectricGame : mêmes courbes, mêmes pas, même score. Sert à régler la difficulté hors ligne.
+
+MAX_VOLTAGE = 5  # Tension maximale d'une dynamo (échelle des batteries)
+
+class LaggingFollower:
+    # Suit la consommation avec un temps de réaction et une montée progressive (premier ordre),
+    # en visant légèrement au-dessus de la courbe pour éviter le malus
+    def __init__(self, reaction_steps=30, gain=0.08, margin=1.05):
+        self.reaction_steps = reaction_steps
+        self.gain = gain
+        self.margin = margin
+
+    def reset(self, players, rng):
+        self.players = players
+        self.production = 0.0
+
+    def act(self, engine):
+        target = engine.target(-self.reaction_steps) * self.margin
+        self.production += self.gain * (target - self.production)
+        share = min(max(self.production / self.players, 0), MAX_VOLTAGE)
+        return (share,) * self.players
+
+class NoisyPlayer:
+    # Un suiveur dont chaque joueur ajoute un bruit propre (pédalage irrégulier)
+    def __init__(self, noise=0.4, follower=None):
+        self.noise = noise
+        self.follower = follower or LaggingFollower()
+
+    def reset(self, players, rng):
+        self.follower.reset(players, rng)
+        self.rng = rng
+
+    def act(self, engine):
+        voltages = np.asarray(self.follower.act(engine), dtype=float)
+        voltages += self.rng.normal(0, self.noise, len(voltages))
+        return tuple(np.clip(voltages, 0, MAX_VOLTAGE).tolist())
+
+class ReplayedHuman:
+    # Rejoue un enregistrement réel (replayInput), rééchantillonné au pas de simulation,
+    # à partir d'un point de départ tiré au hasard. Les voies manquantes reprennent les premières.
+    def __init__(self, path):
+        self.path = path
+        self.samples = None
+
+    def reset(self, players, rng):
+        self.players = players
+        self.rng = rng
+        self.samples = None
+        self.cursor = 0
+
+    def load(self, update_interval):
+        records = load_recording(self.path)
+        if not len(records):
+            raise ValueError(f"{self.path} ne contient aucun échantillon")
+        timestamps = relative_times(records['timestamp'])
+        steps = np.arange(0, timestamps[-1] + 1e-9, update_interval / 1000)
+        indices = np.searchsorted(timestamps, steps, side='right') - 1
+        values = np.asarray(records['values'][indices], dtype=float)
+        self.samples = values[:, np.arange(self.players) % values.shape[1]]
+        self.cursor = int(self.rng.integers(len(self.samples)))
+
+    def act(self, engine):
+        if self.samples is None:
+            self.load(engine.update_interval)
+        voltages = self.samples[self.cursor]
+        self.cursor = (self.cursor + 1) % len(self.samples)
+        return tuple(voltages.tolist())
+
+POLICIES = {
+    'follower': LaggingFollower,
+    'noisy': NoisyPlayer,
+    'replay': ReplayedHuman,
+}
+
+def simulate_game(policy, seed=None, **engine_options):
+    # Une partie complète ; renvoie le bilan du StreamingScorer
+    rng = np.random.default_rng(seed)
+    engine = GameEngine(rng=rng, **engine_options)
+    engine.reset()
+    policy.reset(engine.players, rng)
+    while engine.step(policy.act(engine)):
+        pass
+    return engine.scorer.result()
+
+def simulate_batch(policy, seeds, engine_options):
+    return [simulate_game(policy, seed, **engine_options) for seed in seeds]
+
+def run_batch(policy, games=1000, workers=None, seed=0, **engine_options):
+    # Parties réparties en lots sur un pool de processus ; graines indépendantes et reproductibles
+    seeds = np.random.SeedSequence(seed).spawn(games)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return simulate_batch(policy, seeds, engine_options)
+    # Lots contigus rendus dans l'ordre : results[k] correspond toujours à seeds[k], quel que soit workers
+    size = -(-games // workers)
+    chunks = [seeds[start:start + size] for start in range(0, games, size)]
+    with ProcessPoolExecutor(workers) as executor:
+        batches = executor.map(simulate_batch, [policy] * len(chunks), chunks, [engine_options] * len(chunks))
+        return [result for batch in batches for result in batch]
+
+def score_recording(path, seed=0, **engine_options):
+    # Score de référence d'un enregistrement : un échantillon enregistré par pas de simulation, courbe tirée de la graine.
+    # Le résultat ne dépend que du fichier, de la graine et des réglages : il doit rester identique d'une version à l'autre.
+    replay = ReplayInput(path, speed=None)
+    replay.open()
+    engine = GameEngine(players=replay.channels, rng=seed, **engine_options)
+    engine.reset()
+    while not replay.finished() and engine.step(replay.read_values()):
+        pass
+    replay.close()
+
+    # Contre-vérification : le même bilan recalculé en un seul passage sur les tampons de la partie
+    session, scorer = engine.session, engine.scorer
+    length = session.length
+    scored = (np.arange(1, length + 1) * engine.update_interval / 1000) >= engine.countdown
+    batch = score_run(session.production[:length][scored], session.consumption[:length][scored],
+                      session.voltages[:length][scored], window=scorer.window, step_seconds=scorer.step_seconds,
+                      malus=scorer.malus)
+    result = scorer.result()
+    return {'steps': length, 'result': result, 'matches_batch': batch == result}
+
+def distribution(results, keys=('mean_score', 'below_ratio', 'longest_deficit', 'mean_error')):
+    # Répartition de chaque indicateur sur toutes les parties
+    report = {'games': len(results)}
+    for key in keys:
+        values = np.array([result[key] for result in results])
+        p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+        report[key] = {'mean': float(values.mean()), 'std': float(values.std()), 'p5': float(p5), 'p25': float(p25),
+                       'p50': float(p50), 'p75': float(p75), 'p95': float(p95)}
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parties simulées avec des joueurs automatiques")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='follower')
+    parser.add_argument('--replay', help="Enregistrement joué par la stratégie replay")
+    parser.add_argument('--score-recording', help="Score de référence d'un enregistrement (une partie, sans bot)")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, help="Processus en parallèle (par défaut : un par cœur)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--players', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=60, help="Durée de jeu en secondes")
+    parser.add_argument('--update-interval', type=int, default=10, help="Pas de simulation en millisecondes")
+    parser.add_argument('--malus', type=float, default=3, help="Multiplicateur de l'écart sous la courbe")
+    parser.add_argument('--min-plateau', type=float, default=1.5, help="Durée minimale d'un plateau, en secondes")
+    parser.add_argument('--max-plateau', type=float, default=3.0, help="Durée maximale d'un plateau, en secondes")
+    args = parser.parse_args()
+
+    if args.score_recording:
+        report = score_recording(args.score_recording, args.seed, update_interval=args.update_interval,
+                                 game_duration=args.duration, malus=args.malus,
+                                 plateau_duration=(args.min_plateau, args.max_plateau))
+        print(json.dumps(report, indent=2))
+        raise SystemExit(0 if report['matches_batch'] else 1)
+
+    if args.policy == 'replay':
+        if not args.replay:
+            parser.error("--replay est requis avec --policy replay")
+        policy = ReplayedHuman(args.replay)
+    else:
+        policy = POLICIES[args.policy]()
+
+    start = perf_counter()
+    results = run_batch(policy, args.games, args.workers, args.seed, players=args.players,
+                        update_interval=args.update_interval, game_duration=args.duration, malus=args.malus,
+                        plateau_duration=(args.min_plateau, args.max_plateau))
+    report = distribution(results)
+    report['elapsed_s'] = perf_counter() - start
+    print(json.dumps(report, indent=2))